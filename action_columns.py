@@ -0,0 +1,128 @@
+import threading
+from array import array
+from collections.abc import MutableSequence
+
+from recording_format import decode_action, encode_action
+
+# Column storage for ActionList.actions. Every action is one slot in four parallel arrays,
+# about 13 bytes instead of a tuple holding a type string, a nested (x, y) tuple and a float.
+#
+#   kinds   B   the action's recording_format opcode, so columns and *.aar records share one codec
+#   xs, ys  h   click, move and drag coordinates, scroll steps or repeat counts, widened to i when a value
+#               does not fit in 16 bits. Keys keep their KEY_NAMES index in xs, any other
+#               action the index of its [type, detail] JSON.
+#   delays  q   delay in microseconds since the previous action
+#
+# Reading an item still returns the usual (type, detail, delay) tuple, so the editors and
+# the engine treat it like the plain list it replaces.
+
+INT16_MIN, INT16_MAX = -(1 << 15), (1 << 15) - 1
+
+class KeyTable:
+    # Key names shared by every list, 'a' or 'Key.enter' is stored once however often it is typed
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.lock = threading.Lock()
+
+    def intern(self, name):
+        index = self.index.get(name)
+        if index is None:
+            with self.lock:
+                index = self.index.get(name)
+                if index is None:
+                    index = len(self.names)
+                    self.names.append(name)
+                    self.index[name] = index
+        return index
+
+KEY_NAMES = KeyTable()
+
+class ActionColumns(MutableSequence):
+    __slots__ = ('kinds', 'xs', 'ys', 'delays')
+
+    def __init__(self, actions=()):
+        self.kinds = array('B')
+        self.xs = array('h')
+        self.ys = array('h')
+        self.delays = array('q')
+        self.extend(actions)
+
+    def store(self, index, kind, a, b, delay_us):
+        # index None appends, otherwise the slot is inserted before index
+        if self.xs.typecode == 'h' and not (INT16_MIN <= a <= INT16_MAX and INT16_MIN <= b <= INT16_MAX):
+            self.xs = array('i', self.xs)
+            self.ys = array('i', self.ys)
+        if index is None:
+            self.kinds.append(kind)
+            self.xs.append(a)
+            self.ys.append(b)
+            self.delays.append(delay_us)
+        else:
+            self.kinds.insert(index, kind)
+            self.xs.insert(index, a)
+            self.ys.insert(index, b)
+            self.delays.insert(index, delay_us)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return decode_action(self.kinds[index], self.xs[index], self.ys[index], self.delays[index], KEY_NAMES.names)
+
+    def __iter__(self):
+        for kind, a, b, delay_us in zip(self.kinds, self.xs, self.ys, self.delays):
+            yield decode_action(kind, a, b, delay_us, KEY_NAMES.names)
+
+    def __setitem__(self, index, action):
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                raise ValueError("extended slice assignment is not supported")
+            start, stop, _ = index.indices(len(self))
+            del self[start:stop]
+            for offset, value in enumerate(action):
+                self.insert(start + offset, value)
+            return
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("action index out of range")
+        kind, a, b, delay_us = encode_action(action, KEY_NAMES)
+        del self[index]
+        self.store(index, kind, a, b, delay_us)
+
+    def __delitem__(self, index):
+        del self.kinds[index]
+        del self.xs[index]
+        del self.ys[index]
+        del self.delays[index]
+
+    def insert(self, index, action):
+        index = max(0, min(len(self), index + len(self) if index < 0 else index))
+        self.store(index, *encode_action(action, KEY_NAMES))
+
+    def append(self, action):
+        self.store(None, *encode_action(action, KEY_NAMES))
+
+    def extend(self, actions):
+        for action in actions:
+            self.store(None, *encode_action(action, KEY_NAMES))
+
+    def clear(self):
+        del self[:]
+
+    def copy(self):
+        columns = ActionColumns()
+        columns.kinds = array('B', self.kinds)
+        columns.xs = array(self.xs.typecode, self.xs)
+        columns.ys = array(self.ys.typecode, self.ys)
+        columns.delays = array('q', self.delays)
+        return columns
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (self.kinds, self.xs, self.ys, self.delays))
+
+    def __repr__(self):
+        return f"ActionColumns({list(self)!r})"
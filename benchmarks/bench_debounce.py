@@ -0,0 +1,108 @@
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timers import TimerWheel, debounce
+
+# Bursts of hotkey presses (a held or hammered Home key) through a debounced handler, the old
+# threading.Timer decorator against timers.debounce on the shared timer thread. Reports the
+# threads started, the cost of a press on the listener thread and how late the handler fires.
+#
+#   python benchmarks/bench_debounce.py [bursts] [presses per burst]
+
+WAIT = 0.05  # Debounce wait, shorter than the app's so the run stays quick
+PRESS_INTERVAL = 0.002  # Seconds between presses in a burst, faster than key repeat
+
+def timer_debounce(wait):
+    # The decorator main.py used before timers.py: one new Timer thread per call
+    def decorator(fn):
+        def debounced(*args, **kwargs):
+            def call_it():
+                fn(*args, **kwargs)
+            try:
+                debounced.t.cancel()
+            except(AttributeError):
+                pass
+            debounced.t = threading.Timer(wait, call_it)
+            debounced.t.start()
+        return debounced
+    return decorator
+
+class Handler:
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler
+        self.fired = []  # (perf_counter, thread name)
+        self.done = threading.Event()
+
+    def handle(self):
+        self.fired.append((time.perf_counter(), threading.current_thread().name))
+        self.done.set()
+
+class TimerHandler(Handler):
+    @timer_debounce(WAIT)
+    def press(self):
+        self.handle()
+
+class WheelHandler(Handler):
+    @debounce(WAIT)
+    def press(self):
+        self.handle()
+
+def count_thread_starts():
+    # Wraps Thread.start so every thread the decorator spawns is counted
+    counter = [0]
+    original = threading.Thread.start
+
+    def start(thread):
+        counter[0] += 1
+        original(thread)
+
+    threading.Thread.start = start
+    return counter, lambda: setattr(threading.Thread, 'start', original)
+
+def run(handler, bursts, presses):
+    counter, restore = count_thread_starts()
+    press_costs = []
+    lateness = []
+    peak_threads = threading.active_count()
+    try:
+        for _ in range(bursts):
+            handler.done.clear()
+            for _ in range(presses):
+                start = time.perf_counter()
+                handler.press()
+                press_costs.append(time.perf_counter() - start)
+                peak_threads = max(peak_threads, threading.active_count())
+                time.sleep(PRESS_INTERVAL)
+            last_press = start
+            if not handler.done.wait(5):
+                raise RuntimeError("debounced handler did not fire")
+            lateness.append(handler.fired[-1][0] - last_press - WAIT)
+    finally:
+        restore()
+    return {
+        'fired': len(handler.fired),
+        'threads_started': counter[0],
+        'peak_threads': peak_threads,
+        'press_us_p50': statistics.median(press_costs) * 1e6,
+        'press_us_max': max(press_costs) * 1e6,
+        'late_ms_p50': statistics.median(lateness) * 1000,
+        'late_ms_max': max(lateness) * 1000,
+        'thread': handler.fired[-1][1],
+    }
+
+def main(bursts=20, presses=50):
+    print(f"bursts: {bursts}, presses per burst: {presses}, {PRESS_INTERVAL * 1000:.0f} ms apart, wait {WAIT * 1000:.0f} ms")
+    for name, handler in (('threading.Timer', TimerHandler()), ('timer wheel', WheelHandler(TimerWheel("bench-wheel")))):
+        result = run(handler, bursts, presses)
+        print(f"{name:16} fired {result['fired']:3}   threads started {result['threads_started']:5}   "
+              f"peak threads {result['peak_threads']:3}   press p50 {result['press_us_p50']:6.1f} us "
+              f"max {result['press_us_max']:7.1f} us   late p50 {result['late_ms_p50']:5.2f} ms "
+              f"max {result['late_ms_max']:5.2f} ms   ran on {result['thread']}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20, int(sys.argv[2]) if len(sys.argv) > 2 else 50)
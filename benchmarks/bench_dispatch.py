@@ -0,0 +1,97 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import SPECIAL_KEYS, compile_actions
+
+# Per-action dispatch cost of the old interpreted loop vs. a compiled plan, with a
+# backend that does nothing so only the interpreter overhead is measured.
+#
+#   python benchmarks/bench_dispatch.py [actions]
+
+class NullBackend:
+    def click(self, x, y):
+        pass
+
+    def press(self, key):
+        pass
+
+    def write(self, text):
+        pass
+
+    def moveTo(self, x, y, duration=0.0):
+        pass
+
+    def dragTo(self, x, y, duration=0.0, button='left'):
+        pass
+
+    def mouseDown(self, button='left'):
+        pass
+
+    def mouseUp(self, button='left'):
+        pass
+
+    def scroll(self, clicks):
+        pass
+
+    def hscroll(self, clicks):
+        pass
+
+def synthetic_actions(count, seed=0):
+    rng = random.Random(seed)
+    actions = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            actions.append(['click', [rng.randint(0, 1920), rng.randint(0, 1080)], 0.0])
+        elif rng.random() < 0.2:
+            actions.append(['key', rng.choice(SPECIAL_KEYS), 0.0])
+        else:
+            actions.append(['key', rng.choice('abcdefghijklmnopqrstuvwxyz'), 0.0])
+    return actions
+
+def interpreted(actions, backend, special_keys):
+    # The loop body every playback path used before plans were compiled
+    for action in actions:
+        action_type, action_detail, delay = action
+        if action_type == 'click':
+            x, y = action_detail
+            backend.click(x, y)
+        elif action_type == 'key':
+            if str(action_detail).lower() in [str(key).lower() for key in special_keys]:
+                backend.press(action_detail)
+            else:
+                backend.write(action_detail)
+
+def compiled(plan, backend):
+    handlers = (lambda: None, backend.click, backend.press, backend.write)
+    for op, args, delay in plan:
+        handlers[op](*args)
+
+def best_of(fn, *args, rounds=5):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(count=100000):
+    backend = NullBackend()
+    actions = synthetic_actions(count)
+
+    before = best_of(interpreted, actions, backend, SPECIAL_KEYS)
+    compile_time = best_of(compile_actions, actions)
+    plan = compile_actions(actions)
+    after = best_of(compiled, plan, backend)
+
+    print(f"actions:            {count}")
+    print(f"interpreted:        {before / count * 1e9:8.0f} ns/action")
+    print(f"compiled plan:      {after / count * 1e9:8.0f} ns/action")
+    print(f"compile (one-off):  {compile_time / count * 1e9:8.0f} ns/action")
+    print(f"speedup:            {before / after:8.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
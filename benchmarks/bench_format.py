@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_dispatch import synthetic_actions
+from engine import ActionList, parse_action_lists
+from recording_format import load_binary, save_binary
+
+# File size and load time of the JSON replay format vs. the binary *.aar format.
+#
+#   python benchmarks/bench_format.py [actions]
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def save_json(file_path, action_lists):
+    data = [{
+        'name': action_list.name,
+        'actions': list(action_list.actions),
+        'repeat': action_list.repeat,
+        'sequence': action_list.sequence,
+        'interval': action_list.interval,
+        'active': action_list.active
+    } for action_list in action_lists]
+    with open(file_path, 'w') as file:
+        json.dump(data, file, indent=2)
+
+def load_json(file_path):
+    with open(file_path, 'r') as file:
+        return parse_action_lists(json.load(file))
+
+def touch_all(action_lists):
+    # Decode every action, what a full playback or export would do
+    return sum(1 for action_list in action_lists for _ in action_list.actions)
+
+def main(count=200000):
+    action_list = ActionList("Benchmark")
+    action_list.actions = [(action_type, detail, delay + 0.123456) for action_type, detail, delay in synthetic_actions(count)]
+    action_lists = [action_list]
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'replay.json')
+        binary_path = os.path.join(directory, 'replay.aar')
+
+        _, json_save = timed(save_json, json_path, action_lists)
+        _, binary_save = timed(save_binary, binary_path, action_lists)
+        json_size = os.path.getsize(json_path)
+        binary_size = os.path.getsize(binary_path)
+
+        loaded_json, json_load = timed(load_json, json_path)
+        loaded_binary, binary_load = timed(load_binary, binary_path)
+        _, binary_full = timed(touch_all, loaded_binary)
+
+    print(f"actions:              {count}")
+    print(f"size      json {json_size / 1e6:8.2f} MB   binary {binary_size / 1e6:8.2f} MB   ({json_size / binary_size:.1f}x smaller)")
+    print(f"save      json {json_save * 1000:8.1f} ms   binary {binary_save * 1000:8.1f} ms")
+    print(f"load      json {json_load * 1000:8.1f} ms   binary {binary_load * 1000:8.1f} ms (mmap, lazy)")
+    print(f"decode all                       binary {binary_full * 1000:8.1f} ms")
+    del loaded_json, loaded_binary
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_dispatch import NullBackend
+from engine import ActionList, PlaybackEngine
+
+# Time from setting paused/running (what the hotkeys do) to the playback thread acting on it,
+# measured in the middle of a 30 second delay.
+#
+#   python benchmarks/bench_interrupt.py [trials]
+
+LONG_DELAY = 30.0
+SETTLE = 0.05  # Seconds the playback thread gets to reach the long wait
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+def wait_for_ack(engine, previous, timeout=1.0):
+    # Polls until the engine has acknowledged a new signal, the poll itself is not measured
+    limit = time.perf_counter() + timeout
+    while engine.last_signal_latency is previous:
+        if time.perf_counter() > limit:
+            raise RuntimeError("playback thread did not react within a second")
+        time.sleep(0.0005)
+    return engine.last_signal_latency
+
+def trial(engine):
+    action_list = ActionList("Interrupt")
+    action_list.actions = [('click', (0, 0), LONG_DELAY), ('click', (0, 0), LONG_DELAY)]
+    engine.running = True
+    player = threading.Thread(target=engine.play_action_list, args=(action_list, 1))
+    player.start()
+    time.sleep(SETTLE)
+
+    engine.paused = True
+    pause = wait_for_ack(engine, engine.last_signal_latency)
+    time.sleep(SETTLE)
+    engine.paused = False
+    resume = wait_for_ack(engine, pause)
+    time.sleep(SETTLE)
+    engine.running = False
+    stop = wait_for_ack(engine, resume)
+    player.join()
+    return pause, resume, stop
+
+def main(trials=50):
+    engine = PlaybackEngine(NullBackend())
+    results = {'pause': [], 'resume': [], 'stop': []}
+    for _ in range(trials):
+        engine.last_signal_latency = None
+        for name, latency in zip(('pause', 'resume', 'stop'), trial(engine)):
+            results[name].append(latency)
+
+    print(f"trials: {trials}, {LONG_DELAY:.0f} s delay")
+    for name, samples in results.items():
+        print(f"{name:7} p50 {percentile(samples, 0.5) * 1000:6.3f} ms   p99 {percentile(samples, 0.99) * 1000:6.3f} ms   max {max(samples) * 1000:6.3f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
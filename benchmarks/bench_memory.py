@@ -0,0 +1,36 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from action_columns import ActionColumns
+from bench_dispatch import synthetic_actions
+
+# Memory held by one action list as a plain list of tuples vs. ActionColumns.
+#
+#   python benchmarks/bench_memory.py [actions]
+
+def as_tuples(actions):
+    return [(action_type, tuple(detail) if action_type == 'click' else detail, delay + 0.123456)
+            for action_type, detail, delay in actions]
+
+def measure(build, *args):
+    tracemalloc.start()
+    result = build(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+def main(count=200000):
+    source = synthetic_actions(count)
+    tuples, tuple_bytes = measure(as_tuples, source)
+    columns, column_bytes = measure(ActionColumns, tuples)
+    assert len(columns) == count and columns[count // 2] == tuples[count // 2]
+
+    print(f"actions:        {count}")
+    print(f"list of tuples  {tuple_bytes / 1e6:8.2f} MB   {tuple_bytes / count:6.1f} B/action")
+    print(f"ActionColumns   {column_bytes / 1e6:8.2f} MB   {column_bytes / count:6.1f} B/action   ({tuple_bytes / column_bytes:.1f}x smaller)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,73 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Time-to-interactive of the GUI: from spawning a fresh interpreter to the window having been
+# drawn and the Tk loop going idle, so the first click or hotkey is handled straight away.
+# Every run is a new process in an empty working directory. Needs a display (xvfb-run works).
+#
+#   python benchmarks/bench_startup.py [runs]
+#   python benchmarks/bench_startup.py [runs] --fake-inputs   # pyautogui/pynput replaced by benchmarks/fakes.py
+
+BUDGET = 0.5  # Seconds
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS = os.path.join(REPO, 'benchmarks')
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+if {fake_inputs!r}:
+    import fakes
+    fakes.install_fakes()
+import tkinter as tk
+import main
+imported = time.perf_counter()
+root = tk.Tk()
+app = main.ActionRecorder(root)
+built = time.perf_counter()
+root.update()
+ready = time.perf_counter()
+print(json.dumps({{'import_s': imported - started, 'init_s': built - imported, 'first_draw_s': ready - built}}), flush=True)
+app.cron_scheduler.stop()
+root.destroy()
+"""
+
+def run_once(fake_inputs):
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([REPO, BENCHMARKS, os.environ.get('PYTHONPATH', '')]))
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        child = subprocess.Popen([sys.executable, '-c', CHILD.format(fake_inputs=fake_inputs)], cwd=directory,
+                                 env=environment, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        line = child.stdout.readline()
+        interactive = time.perf_counter() - start
+        _, errors = child.communicate(timeout=30)
+    if not line:
+        raise RuntimeError(errors.strip().splitlines()[-1] if errors.strip() else f"exit code {child.returncode}")
+    phases = json.loads(line)
+    phases['interactive_s'] = interactive
+    return phases
+
+def main(runs=10, fake_inputs=False):
+    try:
+        samples = [run_once(fake_inputs) for _ in range(runs)]
+    except RuntimeError as e:
+        print(f"GUI did not start: {e}", file=sys.stderr)
+        return 2
+
+    print(f"runs: {runs}{' (fake inputs)' if fake_inputs else ''}")
+    for phase in ('import_s', 'init_s', 'first_draw_s', 'interactive_s'):
+        values = [sample[phase] for sample in samples]
+        print(f"{phase[:-2]:13} median {statistics.median(values) * 1000:7.1f} ms   max {max(values) * 1000:7.1f} ms")
+    median = statistics.median(sample['interactive_s'] for sample in samples)
+    verdict = "PASS" if median < BUDGET else "FAIL"
+    print(f"{verdict}: median time-to-interactive {median * 1000:.0f} ms, budget {BUDGET * 1000:.0f} ms")
+    return 0 if median < BUDGET else 1
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if argument != '--fake-inputs']
+    sys.exit(main(int(arguments[0]) if arguments else 10, '--fake-inputs' in sys.argv[1:]))
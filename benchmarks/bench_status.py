@@ -0,0 +1,59 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_dispatch import NullBackend, synthetic_actions
+from engine import ActionList, PlaybackEngine, StatusSlot
+
+# Progress publishing from the playback thread: a fast replay publishes every action into a
+# StatusSlot while a sampler thread stands in for the Tk loop, taking the newest value every
+# STATUS_INTERVAL like ActionRecorder.sample_status(). The UI updates stay at the sample rate
+# however fast the actions play, and the last one drawn is the final count.
+#
+#   python benchmarks/bench_status.py [actions]
+
+STATUS_INTERVAL = 0.033
+
+def play(actions, on_action=None):
+    engine = PlaybackEngine(NullBackend())
+    engine.running = True
+    action_list = ActionList("Status")
+    action_list.actions = actions
+    start = time.perf_counter()
+    engine.play_action_list(action_list, repeat=1, on_action=on_action)
+    return time.perf_counter() - start
+
+def main(count=200000):
+    actions = synthetic_actions(count)
+    baseline = play(actions)
+
+    slot = StatusSlot()
+    drawn = []
+    done = threading.Event()
+
+    def sampler():
+        while not done.is_set():
+            value = slot.take()
+            if value is not None:
+                drawn.append(value)
+            done.wait(STATUS_INTERVAL)
+        value = slot.take()  # What the stop handler draws
+        if value is not None:
+            drawn.append(value)
+
+    thread = threading.Thread(target=sampler)
+    thread.start()
+    published = play(actions, lambda action_list, current, total: slot.publish((action_list.name, current, total)))
+    done.set()
+    thread.join()
+
+    print(f"actions: {count}, played in {published:.2f} s ({count / published:,.0f} actions/s)")
+    print(f"publish cost  {(published - baseline) / count * 1e9:8.0f} ns per action")
+    print(f"UI updates    {len(drawn):8} ({len(drawn) / published:.1f}/s, one per action would be {count})")
+    print(f"last drawn    {drawn[-1][1]}/{drawn[-1][2]}" if drawn else "last drawn    nothing")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
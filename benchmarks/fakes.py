@@ -0,0 +1,117 @@
+import random
+import sys
+import types
+
+from engine import SPECIAL_KEYS
+
+# Stand-ins for pyautogui and pynput, so the benchmarks exercise the real playback and UI code
+# without moving the mouse or needing input permissions. install_fakes() must run before
+# main.py (or anything else importing those packages) is imported.
+
+class RecordingBackend:
+    # Same calls the engine makes on pyautogui, each one appended to calls as (name, args)
+    PAUSE = 0.0
+
+    def __init__(self):
+        self.calls = []
+
+    def click(self, *args, **kwargs):
+        self.calls.append(('click', args))
+
+    def press(self, *args, **kwargs):
+        self.calls.append(('press', args))
+
+    def write(self, *args, **kwargs):
+        self.calls.append(('write', args))
+
+    def moveTo(self, *args, **kwargs):
+        self.calls.append(('moveTo', args))
+
+    def dragTo(self, *args, **kwargs):
+        self.calls.append(('dragTo', args))
+
+    def mouseDown(self, *args, **kwargs):
+        self.calls.append(('mouseDown', args))
+
+    def mouseUp(self, *args, **kwargs):
+        self.calls.append(('mouseUp', args))
+
+    def scroll(self, *args, **kwargs):
+        self.calls.append(('scroll', args))
+
+    def hscroll(self, *args, **kwargs):
+        self.calls.append(('hscroll', args))
+
+class FakeListener:
+    # pynput listener that never reports anything
+    def __init__(self, **callbacks):
+        self.callbacks = callbacks
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def join(self, timeout=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+class FakeKeys:
+    # Any attribute is a distinct key, enough for comparisons like key == keyboard.Key.esc
+    def __getattr__(self, name):
+        key = f"Key.{name}"
+        setattr(self, name, key)
+        return key
+
+def install_fakes(backend=None):
+    # Returns the RecordingBackend that now answers as pyautogui
+    backend = backend or RecordingBackend()
+    pyautogui = types.ModuleType('pyautogui')
+    for name in ('click', 'press', 'write', 'moveTo', 'dragTo', 'mouseDown', 'mouseUp', 'scroll', 'hscroll'):
+        setattr(pyautogui, name, getattr(backend, name))
+    pyautogui.PAUSE = backend.PAUSE
+
+    mouse = types.ModuleType('pynput.mouse')
+    mouse.Listener = FakeListener
+    mouse.Button = types.SimpleNamespace(left='Button.left', right='Button.right', middle='Button.middle')
+    keyboard = types.ModuleType('pynput.keyboard')
+    keyboard.Listener = FakeListener
+    keyboard.Key = FakeKeys()
+    pynput = types.ModuleType('pynput')
+    pynput.mouse = mouse
+    pynput.keyboard = keyboard
+
+    sys.modules.update({
+        'pyautogui': pyautogui,
+        'pynput': pynput,
+        'pynput.mouse': mouse,
+        'pynput.keyboard': keyboard,
+    })
+    return backend
+
+def synthetic_recording(count, delay=0.0, seed=0):
+    # A recording with every action type in roughly the mix a motion recording produces
+    rng = random.Random(seed)
+    actions = []
+    for _ in range(count):
+        roll = rng.random()
+        x, y = rng.randint(0, 1920), rng.randint(0, 1080)
+        if roll < 0.2:
+            actions.append(('click', (x, y), delay))
+        elif roll < 0.45:
+            actions.append(('move', (x, y), delay))
+        elif roll < 0.55:
+            actions.append(('drag', (x, y), delay))
+        elif roll < 0.6:
+            actions.append(('scroll', (0, rng.choice((-1, 1))), delay))
+        elif roll < 0.7:
+            actions.append(('key', rng.choice(SPECIAL_KEYS), delay))
+        else:
+            actions.append(('key', rng.choice('abcdefghijklmnopqrstuvwxyz'), delay))
+    return actions
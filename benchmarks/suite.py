@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import RecordingBackend, install_fakes, synthetic_recording
+
+# Hot path benchmarks with pyautogui and pynput replaced by fakes, written as one JSON document
+# so runs can be compared across versions. Progress goes to stderr, results to stdout or --output.
+#
+#   python benchmarks/suite.py [--sizes 1000,10000,100000,1000000] [--output results.json]
+#   xvfb-run python benchmarks/suite.py --output results.json   # includes the Tk refresh costs
+#
+# Every result is {"benchmark", "actions", "metrics": {name: value}}, times in the unit named
+# by the metric's suffix (_ns_per_action, _ms, _s). Benchmarks that cannot run here are listed
+# under "skipped" with the reason.
+
+# Must come before anything imports engine's backend or main.py
+BACKEND = install_fakes()
+
+from engine import ActionList, PlaybackEngine, compile_actions, parse_action_lists
+from importer import iter_action_lists
+from metrics import ListMetrics
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+LATENESS_ACTIONS = 2000  # Actions played on a real timeline, LATENESS_DELAY apart
+LATENESS_DELAY = 0.001
+UI_MAX_ACTIONS = 100000  # The record tab inserts every row, larger lists take minutes
+REPLAY_LIST_SIZE = 100  # Actions per list when a replay of n actions is built for update_replay_list()
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def best_of(fn, *args, rounds=3):
+    best = float('inf')
+    for _ in range(rounds):
+        _, elapsed = timed(fn, *args)
+        best = min(best, elapsed)
+    return best
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def bench_dispatch(count):
+    # Interpreter cost per action: zero delays, so no time is spent waiting
+    actions = synthetic_recording(count)
+    engine = PlaybackEngine(BACKEND)
+    engine.running = True
+    compile_time = best_of(compile_actions, actions, rounds=1 if count >= 1000000 else 3)
+    plan = compile_actions(actions)
+
+    def play():
+        BACKEND.calls.clear()
+        engine.play_actions(plan)
+
+    def play_timed():
+        BACKEND.calls.clear()
+        engine.play_actions(plan, metrics=ListMetrics())
+
+    rounds = 1 if count >= 1000000 else 3
+    play_time = best_of(play, rounds=rounds)
+    timed_time = best_of(play_timed, rounds=rounds)
+    return {
+        'compile_ns_per_action': compile_time / count * 1e9,
+        'dispatch_ns_per_action': play_time / count * 1e9,
+        'dispatch_with_metrics_ns_per_action': timed_time / count * 1e9,
+        'input_calls': len(BACKEND.calls),
+    }
+
+def bench_lateness(count=LATENESS_ACTIONS, delay=LATENESS_DELAY):
+    engine = PlaybackEngine(RecordingBackend())
+    engine.running = True
+    action_list = ActionList("Lateness")
+    action_list.actions = synthetic_recording(count, delay)
+    engine.play_action_list(action_list, repeat=1)
+    timing = engine.last_timing
+    return {
+        'delay_ms': delay * 1000,
+        'lateness_max_ms': timing['max_ms'],
+        'lateness_p99_ms': timing['p99_ms'],
+        'lateness_mean_ms': timing['mean_ms'],
+        'estimate_s': engine.last_estimate,
+        'duration_s': engine.last_duration,
+    }
+
+def replay_json(action_lists):
+    # Same document ActionRecorder.save_replay() writes
+    return [{
+        'name': action_list.name,
+        'actions': list(action_list.actions),
+        'repeat': action_list.repeat,
+        'sequence': action_list.sequence,
+        'interval': action_list.interval,
+        'active': action_list.active,
+        'speed': action_list.speed,
+        'max_gap': action_list.max_gap
+    } for action_list in action_lists]
+
+def bench_json(count, directory):
+    action_list = ActionList("Benchmark")
+    action_list.actions = synthetic_recording(count, 0.123456)
+    path = os.path.join(directory, f"replay-{count}.json")
+
+    def export():
+        with open(path, 'w') as file:
+            json.dump(replay_json([action_list]), file, indent=2)
+
+    def load():
+        with open(path, 'r') as file:
+            return parse_action_lists(json.load(file))
+
+    _, export_time = timed(export)
+    _, load_time = timed(load)
+    _, stream_time = timed(lambda: list(iter_action_lists(path)))
+    return {
+        'export_s': export_time,
+        'load_s': load_time,
+        'stream_import_s': stream_time,
+        'file_bytes': os.path.getsize(path),
+    }
+
+def start_ui(directory):
+    # The app logs and journals into its working directory, keep that out of the checkout
+    import tkinter as tk
+    os.chdir(directory)
+    import main
+    root = tk.Tk()
+    return root, main.ActionRecorder(root)
+
+def bench_ui(app, root, count):
+    metrics = {}
+    if count <= UI_MAX_ACTIONS:
+        app.current_list = ActionList("Benchmark")
+        app.current_list.actions = synthetic_recording(count, 0.1)
+
+        def refresh_record():
+            app.update_action_list()
+            root.update_idletasks()
+
+        metrics['update_action_list_s'] = best_of(refresh_record, rounds=1)
+
+    app.action_lists = []
+    for i in range(max(1, count // REPLAY_LIST_SIZE)):
+        action_list = ActionList(f"List {i + 1}", i)
+        action_list.actions = synthetic_recording(REPLAY_LIST_SIZE, 0.1, seed=i)
+        app.action_lists.append(action_list)
+
+    def refresh_replay():
+        app.update_replay_list()
+        root.update_idletasks()
+
+    metrics['update_replay_list_s'] = best_of(refresh_replay)
+    metrics['replay_lists'] = len(app.action_lists)
+    return metrics
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark playback, import/export and UI refresh with fake input backends.")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma separated action counts (default %(default)s)")
+    parser.add_argument('--output', help="Write the JSON results here instead of stdout")
+    parser.add_argument('--skip-ui', action='store_true', help="Leave out the Tk refresh benchmarks")
+    args = parser.parse_args(argv)
+    try:
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    except ValueError:
+        parser.error("--sizes must be a comma separated list of integers")
+    if not sizes or min(sizes) < 1:
+        parser.error("--sizes must be positive")
+    output = os.path.abspath(args.output) if args.output else None
+
+    results = []
+    skipped = []
+
+    def record(benchmark, actions, metrics):
+        log(f"{benchmark:10} {actions:>8}  " + ", ".join(f"{name} {value:.4g}" for name, value in metrics.items()))
+        results.append({'benchmark': benchmark, 'actions': actions, 'metrics': metrics})
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sizes:
+            record('dispatch', count, bench_dispatch(count))
+        record('lateness', LATENESS_ACTIONS, bench_lateness())
+        for count in sizes:
+            record('json', count, bench_json(count, directory))
+
+        if args.skip_ui:
+            skipped.append({'benchmark': 'ui', 'reason': "--skip-ui"})
+        elif not os.environ.get('DISPLAY') and sys.platform.startswith('linux'):
+            skipped.append({'benchmark': 'ui', 'reason': "no DISPLAY, run under xvfb-run"})
+        else:
+            cwd = os.getcwd()
+            try:
+                root, app = start_ui(directory)
+            except Exception as e:
+                skipped.append({'benchmark': 'ui', 'reason': f"{type(e).__name__}: {e}"})
+            else:
+                try:
+                    for count in sizes:
+                        record('ui', count, bench_ui(app, root, count))
+                finally:
+                    app.cron_scheduler.stop()
+                    root.destroy()
+            finally:
+                os.chdir(cwd)
+
+    for entry in skipped:
+        log(f"skipped {entry['benchmark']}: {entry['reason']}")
+
+    document = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+        'skipped': skipped,
+    }
+    if output:
+        with open(output, 'w') as file:
+            json.dump(document, file, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
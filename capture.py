@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import deque
+
+# Hand-off of input events from the pynput listener threads to the Tk thread. Events are
+# stamped with perf_counter_ns inside the listener callback and pushed into a bounded ring;
+# the UI drains it in batches on a timer, so queueing on a busy Tk loop never shows up in the
+# recorded delays. deque.append and popleft are atomic, so draining takes no lock; the two
+# listener threads share one only to count the events a full ring drops.
+
+RING_CAPACITY = 1 << 16
+DRAIN_INTERVAL = 20  # ms between drains of the ring while recording
+
+class EventRing:
+    def __init__(self, capacity=RING_CAPACITY):
+        self.events = deque(maxlen=capacity)
+        self.capacity = capacity
+        self.dropped = 0
+        self.lock = threading.Lock()  # Guards dropped and the full check against the other listener
+
+    def push(self, kind, detail, timestamp=None):
+        # Called on a listener thread. A full ring drops the oldest event rather than blocking input.
+        event = (time.perf_counter_ns() if timestamp is None else timestamp, kind, detail)
+        with self.lock:
+            if len(self.events) == self.capacity:
+                self.dropped += 1
+            self.events.append(event)
+
+    def take_dropped(self):
+        # Events dropped since the last call
+        with self.lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    def drain(self, limit=None):
+        batch = []
+        popleft = self.events.popleft
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(popleft())
+            except IndexError:
+                break
+        return batch
+
+    def clear(self):
+        with self.lock:
+            self.events.clear()
+            self.dropped = 0
+
+class DelayClock:
+    # Turns event timestamps into the per action delays stored in an ActionList
+    def __init__(self, start=None):
+        self.last = time.perf_counter_ns() if start is None else start
+
+    def delay(self, timestamp):
+        delay = max(0, timestamp - self.last) / 1e9
+        self.last = timestamp
+        return delay
+
+# Mouse motion is buffered into strokes and simplified before it reaches the recording.
+# Points closer than MIN_DISTANCE to the last kept one are dropped as they arrive, and a
+# finished stroke is reduced with Ramer-Douglas-Peucker so only its corners are stored.
+MIN_DISTANCE = 3  # px
+RDP_EPSILON = 2.0  # px a simplified path may stray from the recorded one
+DRAG_THRESHOLD = 5  # px the pointer must travel with the button held before a click becomes a drag
+STROKE_GAP = 100_000_000  # ns without motion that ends a stroke
+MAX_STROKE_POINTS = 4096
+
+def rdp(points, epsilon=RDP_EPSILON):
+    # Indices of the (timestamp, x, y) points kept by Ramer-Douglas-Peucker, first and last always
+    if len(points) < 3:
+        return list(range(len(points)))
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        _, x1, y1 = points[first]
+        _, x2, y2 = points[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = (dx * dx + dy * dy) ** 0.5
+        worst, worst_index = 0.0, None
+        for i in range(first + 1, last):
+            _, x, y = points[i]
+            if length:
+                distance = abs(dy * (x - x1) - dx * (y - y1)) / length
+            else:
+                distance = ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+            if distance > worst:
+                worst, worst_index = distance, i
+        if worst_index is not None and worst > epsilon:
+            keep[worst_index] = True
+            stack.append((first, worst_index))
+            stack.append((worst_index, last))
+    return [i for i, kept in enumerate(keep) if kept]
+
+class MotionSimplifier:
+    # Turns the raw listener stream ('move', 'press', 'release', 'scroll', 'click', 'key') into
+    # recorded events ('move', 'drag', 'click', 'scroll', 'key'), all still (timestamp, kind, detail).
+    # A press and release without travel is a click; with travel it becomes a move to the press
+    # point followed by the simplified drag path.
+    def __init__(self, epsilon=RDP_EPSILON, min_distance=MIN_DISTANCE, drag_threshold=DRAG_THRESHOLD, stroke_gap=STROKE_GAP):
+        self.epsilon = epsilon
+        self.min_distance = min_distance
+        self.drag_threshold = drag_threshold
+        self.stroke_gap = stroke_gap
+        self.stroke = []
+        self.tail = None  # Latest point too close to the stroke to keep on its own
+        self.anchor = None  # Last emitted (timestamp, x, y), where the next stroke starts from
+        self.press = None
+        self.dragging = False
+
+    def feed(self, timestamp, kind, detail):
+        out = []
+        if kind == 'move':
+            x, y = detail
+            last = self.tail or (self.stroke[-1] if self.stroke else None)
+            if last and timestamp - last[0] > self.stroke_gap:
+                out += self.finish_stroke()
+            if self.press and not self.dragging:
+                _, px, py = self.press
+                if abs(x - px) < self.drag_threshold and abs(y - py) < self.drag_threshold:
+                    return out
+                self.dragging = True
+                out.append(self.emit(self.press, 'move'))
+            if self.stroke:
+                _, lx, ly = self.stroke[-1]
+                if abs(x - lx) < self.min_distance and abs(y - ly) < self.min_distance:
+                    # Too close to keep, but the stroke still has to end where the pointer did
+                    self.tail = (timestamp, x, y)
+                    return out
+            self.tail = None
+            self.stroke.append((timestamp, x, y))
+            if len(self.stroke) >= MAX_STROKE_POINTS:
+                out += self.finish_stroke()
+            return out
+
+        out += self.finish_stroke()
+        if kind == 'press':
+            out += self.resolve_press()
+            self.press = (timestamp, detail[0], detail[1])
+        elif kind == 'release':
+            if self.press and not self.dragging:
+                out += self.resolve_press()
+            elif self.dragging:
+                # The release point closes the drag even when no motion event reported it
+                if self.anchor is None or self.anchor[1:] != tuple(detail):
+                    out.append(self.emit((timestamp, detail[0], detail[1]), 'drag'))
+            self.press = None
+            self.dragging = False
+        else:
+            out += self.resolve_press()
+            if kind == 'click':
+                self.anchor = (timestamp, detail[0], detail[1])
+            out.append((timestamp, kind, detail))
+        return out
+
+    def resolve_press(self):
+        # A press that has not turned into a drag yet is recorded as a click at its own time
+        if not self.press or self.dragging:
+            return []
+        event = self.emit(self.press, 'click')
+        self.press = None
+        return [event]
+
+    def emit(self, point, kind):
+        self.anchor = point
+        timestamp, x, y = point
+        return (timestamp, kind, (x, y))
+
+    def finish_stroke(self):
+        if not self.stroke:
+            return []
+        if self.tail:
+            self.stroke.append(self.tail)
+            self.tail = None
+        kind = 'drag' if self.dragging else 'move'
+        points = ([self.anchor] if self.anchor else []) + self.stroke
+        skip = 1 if self.anchor else 0
+        self.stroke = []
+        return [self.emit(points[i], kind) for i in rdp(points, self.epsilon) if i >= skip]
+
+    def flush_idle(self, now):
+        # Ends a stroke once the pointer has rested, so moves show up without waiting for a click
+        last = self.tail or (self.stroke[-1] if self.stroke else None)
+        if last and now - last[0] > self.stroke_gap:
+            return self.finish_stroke()
+        return []
+
+    def finish(self):
+        return self.finish_stroke() + self.resolve_press()
@@ -0,0 +1,243 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from engine import ActionList, PlaybackEngine, SPECIAL_KEYS
+
+# Cron job timing shared by the GUI. Jobs are the plain dicts stored in
+# ActionRecorder.cron_jobs; only 'cron_expression' and 'active' are read here.
+
+TIME_FORMAT = "%I:%M %p"
+
+# The timer thread re-checks at least this often so wall clock changes and suspends are picked up
+MAX_WAIT = 60
+
+def parse_schedule(text):
+    # "05:30 PM" style times become a daily expression, anything else must be a cron expression
+    text = text.strip()
+    try:
+        time_obj = datetime.strptime(text, TIME_FORMAT)
+        return f"{time_obj.minute} {time_obj.hour} * * *"
+    except ValueError:
+        pass
+    # croniter is only imported once a schedule is actually parsed, it is slow to load
+    from croniter import croniter
+    if not croniter.is_valid(text):
+        raise ValueError(f"Invalid time or cron expression: {text}")
+    return text
+
+def next_fire_time(cron_expression, after):
+    # after is a naive local datetime; croniter treats float start times as UTC
+    from croniter import croniter
+    return croniter(cron_expression, after).get_next(datetime).timestamp()
+
+def day_order_key(cron_expression):
+    # Sort key that lists daily jobs by time of day, invalid expressions go last
+    midnight = datetime.combine(datetime.now().date(), datetime.min.time()) - timedelta(seconds=1)
+    try:
+        return next_fire_time(cron_expression, midnight)
+    except ValueError:
+        return float('inf')
+
+class CronScheduler:
+    # Min-heap of (next fire timestamp, tie breaker, job, cron expression the time came from).
+    # Peeking at the next due job is O(1) and every firing costs one O(log n) heap replace,
+    # however many jobs are loaded.
+    # start() runs the heap on its own timer thread so a busy Tk main loop cannot delay a firing.
+    def __init__(self):
+        self.heap = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.latency = {}  # id(job) -> (last, worst) seconds between scheduled and actual start
+        self.on_fire = None
+        self.thread = None
+        self.stopped = False
+
+    def reschedule(self, jobs, now=None):
+        # Jobs already in the heap with the same expression keep their fire time, so one coming
+        # due while the list is being edited still fires. New or changed jobs are timed from now.
+        now = now or datetime.now()
+        heap = []
+        with self.condition:
+            existing = {id(job): (fire_at, job, expression) for fire_at, _, job, expression in self.heap}
+            for job in jobs:
+                if not job.get('active', True):
+                    continue
+                try:
+                    expression = job['cron_expression']
+                    fire_at, scheduled_job, scheduled_expression = existing.get(id(job), (None, None, None))
+                    if scheduled_job is not job or scheduled_expression != expression:
+                        fire_at = next_fire_time(expression, now)
+                    heap.append((fire_at, next(self.counter), job, expression))
+                except (KeyError, ValueError) as e:
+                    logging.error(f"Cron job {job.get('name')} not scheduled: {str(e)}")
+            heapq.heapify(heap)
+            self.heap = heap
+            self.latency = {id(job): self.latency[id(job)] for job in jobs if id(job) in self.latency}
+            self.condition.notify()
+
+    def next_due(self):
+        with self.condition:
+            return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now=None):
+        # Returns [(scheduled timestamp, job)] for everything due by now and queues each job's
+        # following occurrence. A late check still fires the job once instead of missing it.
+        now = time.time() if now is None else now
+        due = []
+        with self.condition:
+            while self.heap and self.heap[0][0] <= now:
+                scheduled, _, job, expression = self.heap[0]
+                due.append((scheduled, job))
+                following = next_fire_time(expression, datetime.fromtimestamp(max(scheduled, now)))
+                heapq.heapreplace(self.heap, (following, next(self.counter), job, expression))
+        return due
+
+    def start(self, on_fire):
+        # on_fire(job, scheduled) runs on the timer thread, it should only hand the job off
+        self.on_fire = on_fire
+        self.stopped = False
+        self.thread = threading.Thread(target=self.run, name="cron-timer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.stopped:
+                    next_due = self.next_due()
+                    now = time.time()
+                    if next_due is not None and next_due <= now:
+                        break
+                    self.condition.wait(MAX_WAIT if next_due is None else min(MAX_WAIT, next_due - now))
+                if self.stopped:
+                    return
+                due = self.pop_due()
+
+            for scheduled, job in due:
+                self.record_latency(job, time.time() - scheduled)
+                try:
+                    self.on_fire(job, scheduled)
+                except Exception as e:
+                    logging.error(f"Cron job {job.get('name')} failed to start: {str(e)}")
+
+    def record_latency(self, job, latency):
+        with self.condition:
+            _, worst = self.latency.get(id(job), (0.0, 0.0))
+            self.latency[id(job)] = (latency, max(worst, latency))
+        logging.info(f"Cron job {job.get('name')} fired {latency * 1000:.1f} ms after its scheduled time")
+
+    def job_latency(self, job):
+        return self.latency.get(id(job))
+
+# What to do when a job fires while an earlier run of it is still queued or playing
+OVERLAP_POLICIES = ('queue', 'skip', 'replace')
+
+class CronRun:
+    # One firing of a job. Every run plays on its own engine, so cancel() stops just this run.
+    def __init__(self, job, scheduled=None, special_keys=SPECIAL_KEYS):
+        self.job = job
+        self.scheduled = scheduled
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancelled = False
+        self.engine = PlaybackEngine(special_keys=special_keys)
+        self.engine.running = True
+
+    def cancel(self):
+        self.cancelled = True
+        self.engine.stop()
+
+    @property
+    def queue_wait(self):
+        return (self.started_at or time.time()) - self.queued_at
+
+class CronRunManager:
+    # FIFO queue of cron runs played by at most max_workers threads at a time. The default of one
+    # keeps two jobs from driving the mouse and keyboard at the same time.
+    def __init__(self, max_workers=1, special_keys=SPECIAL_KEYS, on_start=None, on_finish=None):
+        self.max_workers = max_workers
+        self.special_keys = special_keys
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.coalesce = None  # Passed on to every run's engine, see PlaybackEngine.coalesce
+        self.metrics = None  # Likewise PlaybackEngine.metrics
+        self.queue = deque()
+        self.running = []
+        self.workers = []
+        self.condition = threading.Condition()
+
+    def set_max_workers(self, max_workers):
+        with self.condition:
+            self.max_workers = max(1, max_workers)
+            self.condition.notify_all()
+
+    def submit(self, job, scheduled=None):
+        # Returns the queued CronRun, or None when the job's overlap policy skipped it
+        policy = job.get('overlap', 'queue')
+        with self.condition:
+            if policy in ('skip', 'replace'):
+                earlier = [run for run in self.running if run.job is job] + [run for run in self.queue if run.job is job]
+                if earlier and policy == 'skip':
+                    logging.info(f"Cron job {job.get('name')} skipped, previous run still active")
+                    return None
+                for run in earlier:
+                    run.cancel()
+                    if run in self.queue:
+                        self.queue.remove(run)
+            run = CronRun(job, scheduled, self.special_keys)
+            run.engine.coalesce = self.coalesce
+            run.engine.metrics = self.metrics
+            self.queue.append(run)
+            if len(self.workers) < self.max_workers:
+                worker = threading.Thread(target=self.work, name=f"cron-worker-{len(self.workers) + 1}", daemon=True)
+                self.workers.append(worker)
+                worker.start()
+            self.condition.notify_all()
+        return run
+
+    def active(self):
+        with self.condition:
+            return bool(self.queue or self.running)
+
+    def cancel_all(self):
+        with self.condition:
+            for run in list(self.queue) + self.running:
+                run.cancel()
+            self.queue.clear()
+
+    def work(self):
+        while True:
+            with self.condition:
+                while not self.queue or len(self.running) >= self.max_workers:
+                    self.condition.wait()
+                run = self.queue.popleft()
+                self.running.append(run)
+            run.started_at = time.time()
+            logging.info(f"Cron job {run.job.get('name')} started after {run.queue_wait * 1000:.1f} ms in the queue")
+            try:
+                if self.on_start:
+                    self.on_start(run)
+                action_list = ActionList(run.job['name'])
+                action_list.actions = run.job['actions']
+                action_list.speed = run.job.get('speed', 1.0)
+                action_list.max_gap = run.job.get('max_gap')
+                run.engine.play_action_list(action_list, repeat=1)
+            except Exception as e:
+                logging.error(f"Cron job {run.job.get('name')} failed: {str(e)}")
+            finally:
+                run.finished_at = time.time()
+                with self.condition:
+                    self.running.remove(run)
+                    self.condition.notify_all()
+                if self.on_finish:
+                    self.on_finish(run)
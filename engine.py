@@ -0,0 +1,837 @@
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from collections.abc import Sequence
+
+from action_columns import ActionColumns
+from metrics import Histogram, ListMetrics, MetricsRegistry, write_metrics
+from vision import find_image, parse_target, region_matches
+
+# Playback engine shared by the GUI (main.py) and the headless command line.
+# Nothing in here may import tkinter; pyautogui is only imported on first use.
+#
+#   python -m engine play replay.json --repeat 3
+
+SPECIAL_KEYS = [
+    'space',
+    'enter',
+    'shift',
+    'ctrl',
+    'alt',
+    'tab',
+    'backspace',
+    'delete',
+    'esc',
+    'up',
+    'down',
+    'left',
+    'right',
+    'home',
+    'end',
+    'pageup',
+    'pagedown'
+]
+
+# pynput reports scrolling in wheel notches, pyautogui on Windows expects raw wheel delta
+SCROLL_SCALE = 120 if sys.platform == 'win32' else 1
+
+# Waits shorter than this are spun out on perf_counter instead of trusting a timed wait
+SPIN_THRESHOLD = 0.002
+
+class Timeline:
+    # Absolute perf_counter schedule built from the recorded delays, so dispatch cost and
+    # sleep overshoot of one action never push back the ones after it. Lateness goes into a
+    # fixed size histogram, a replay repeating until stopped keeps the same small footprint.
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.offset = 0.0
+        self.waited = 0.0
+        self.lateness = Histogram()
+        self.last_lateness = 0.0
+
+    def next_deadline(self, delay):
+        self.offset += delay
+        return self.origin + self.waited + self.offset
+
+    def shift(self, seconds):
+        # Pauses move the rest of the timeline instead of being caught up afterwards
+        self.origin += seconds
+
+    def add_wait(self, seconds):
+        # Time spent in a wait action moves the later deadlines too, but unlike a pause it is
+        # played time, so the origin (and with it the measured duration) stays put
+        self.waited += seconds
+
+    def record(self, deadline):
+        self.last_lateness = time.perf_counter() - deadline
+        self.lateness.observe(self.last_lateness)
+
+    def summary(self):
+        # p99 is the upper bound of its histogram bucket, max and mean are exact
+        count = self.lateness.count
+        if not count:
+            return {'actions': 0, 'max_ms': 0.0, 'p99_ms': 0.0, 'mean_ms': 0.0}
+        return {
+            'actions': count,
+            'max_ms': self.lateness.maximum * 1000,
+            'p99_ms': self.lateness.quantile(0.99) * 1000,
+            'mean_ms': self.lateness.total / count * 1000,
+        }
+
+def format_timing(summary):
+    return f"lateness max {summary['max_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms, mean {summary['mean_ms']:.2f} ms"
+
+def format_duration(seconds):
+    if seconds < 60:
+        return f"{seconds:.1f} s"
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+# Opcodes of a compiled plan, each op is (opcode, args, delay) and dispatches through PlaybackEngine.handlers()
+OP_NONE, OP_CLICK, OP_PRESS, OP_WRITE, OP_MOVE, OP_DRAG, OP_SCROLL, OP_LOOP, OP_WAIT_IMAGE, OP_WAIT_PIXEL = range(10)
+OP_NAMES = ('none', 'click', 'press', 'write', 'move', 'drag', 'scroll', 'loop', 'image', 'pixel')
+
+# (OP_LOOP, (count, length), delay) plays the `length` ops after it `count` times. It is
+# interpreted by play_actions() itself, repeat blocks are never unrolled into the plan.
+
+# Wait ops, from OP_WAIT_IMAGE on, carry their timeout and policy as the last two args. Their
+# handler is a probe taking the other args, polled by PlaybackEngine.wait_for() until it returns True.
+#   ('image', (path, region, timeout[, policy]), delay)   region is (left, top, width, height) or None
+#   ('pixel', (region, target, timeout, policy), delay)   region is (x, y) or (left, top, width, height),
+#                                                          target as in vision.parse_target()
+# The delays after a wait count from the moment it ended, not from the recorded timeline.
+# When a wait times out or its probe raises, 'continue' plays on and 'stop' stops playback like
+# the Stop button.
+WAIT_POLICIES = ('continue', 'stop')
+
+# Seconds between two probes of a wait action
+POLL_INTERVAL = 0.05
+
+# A recorded move glides to its point over its own delay. Longer gaps are mostly the pointer
+# resting before it moved, so only this much of the delay is spent gliding.
+MAX_GLIDE = 1.0
+
+def compile_actions(actions, special_keys=SPECIAL_KEYS):
+    # Resolve everything that does not change between runs once: action type, special key
+    # lookup and coordinate conversion. Unknown action types keep their delay but do nothing.
+    # Moves start right after the previous op and run for their glide, which is carried into
+    # the next op's delay like coalesce_plan() does. A run of drag segments becomes one op,
+    # so the button stays down along the whole path. Repeat blocks compile to OP_LOOP.
+    special = frozenset(str(key).lower() for key in special_keys)
+    ops, _ = _compile_block(iter(actions), special, None)
+    return tuple(ops)
+
+def _compile_block(actions, special, limit):
+    # Compiles up to limit actions (all when None) from the iterator, returns (ops, actions read)
+    ops = []
+    carry = 0.0
+    consumed = 0
+    previous = None
+    if limit == 0:
+        return ops, consumed
+    for action_type, action_detail, delay in actions:
+        consumed += 1
+        follows_drag = previous == 'drag'
+        previous = action_type
+        own = float(delay)
+        delay = own + carry
+        carry = 0.0
+        if action_type == 'click':
+            x, y = action_detail
+            ops.append((OP_CLICK, (int(x), int(y)), delay))
+        elif action_type == 'key':
+            if str(action_detail).lower() in special:
+                ops.append((OP_PRESS, (action_detail,), delay))
+            else:
+                ops.append((OP_WRITE, (action_detail,), delay))
+        elif action_type == 'move':
+            x, y = action_detail
+            glide = min(own, MAX_GLIDE)
+            ops.append((OP_MOVE, (int(x), int(y), glide), delay - glide))
+            carry = glide
+        elif action_type == 'drag':
+            # The button stays down for the whole path, so a drag segment glides for all of its delay
+            x, y = action_detail
+            segment = (int(x), int(y), own)
+            if follows_drag:
+                path, = ops[-1][1]
+                ops[-1] = (OP_DRAG, (path + (segment,),), ops[-1][2])
+                carry = delay
+            else:
+                ops.append((OP_DRAG, ((segment,),), delay - own))
+                carry = own
+        elif action_type == 'scroll':
+            dx, dy = action_detail
+            ops.append((OP_SCROLL, (int(dx), int(dy)), delay))
+        elif action_type == 'image':
+            path, region, timeout, *policy = action_detail
+            region = tuple(int(value) for value in region) if region else None
+            ops.append((OP_WAIT_IMAGE, (str(path), region, float(timeout), wait_policy(*policy)), delay))
+        elif action_type == 'pixel':
+            region, target, timeout, policy = action_detail
+            region = tuple(int(value) for value in region)
+            if len(region) == 2:
+                region += (1, 1)
+            elif len(region) != 4:
+                raise ValueError(f"A pixel wait needs (x, y) or (left, top, width, height), got {region!r}")
+            ops.append((OP_WAIT_PIXEL, (region, parse_target(target), float(timeout), wait_policy(policy)), delay))
+        elif action_type == 'repeat':
+            count, length = action_detail
+            inner, used = _compile_block(actions, special, int(length))
+            consumed += used
+            ops.append((OP_LOOP, (int(count), len(inner)), delay))
+            ops.extend(inner)
+        else:
+            ops.append((OP_NONE, (), delay))
+        if limit is not None and consumed >= limit:
+            break
+    if carry and limit is not None:
+        # A glide closing a loop body has to be waited out before the next pass starts
+        ops.append((OP_NONE, (), carry))
+    return ops, consumed
+
+def wait_policy(policy='continue'):
+    if policy not in WAIT_POLICIES:
+        raise ValueError(f"On timeout must be one of {', '.join(WAIT_POLICIES)}, got {policy!r}")
+    return policy
+
+def plan_totals(plan, start=0, end=None):
+    # (input calls, seconds of delay) of a compiled plan with its loops unrolled
+    end = len(plan) if end is None else end
+    calls = 0
+    seconds = 0.0
+    i = start
+    while i < end:
+        op, args, delay = plan[i]
+        seconds += delay
+        if op == OP_LOOP:
+            count, length = args
+            body_calls, body_seconds = plan_totals(plan, i + 1, i + 1 + length)
+            calls += count * body_calls
+            seconds += count * body_seconds
+            i += 1 + length
+        else:
+            calls += 1
+            i += 1
+    return calls, seconds
+
+# Keys and clicks closer together than this are merged by coalesce_plan()
+COALESCE_THRESHOLD = 0.15
+
+def _is_char(text):
+    return isinstance(text, str) and len(text) == 1 and text.isprintable()
+
+def coalesce_plan(plan, threshold=COALESCE_THRESHOLD, in_loop=False):
+    # Merge runs of printable keys into one write(text, interval) and identical back-to-back
+    # clicks into one click(x, y, clicks, interval). The merged delays are spent inside that
+    # single call, so they are carried into the next op to keep the timeline where it was.
+    # Loop bodies are coalesced on their own, runs never cross a loop boundary.
+    ops = []
+    carry = 0.0
+    i = 0
+    total = len(plan)
+    while i < total:
+        op, args, delay = plan[i]
+        j = i + 1
+        if op == OP_LOOP:
+            count, length = args
+            body = coalesce_plan(plan[i + 1:i + 1 + length], threshold, in_loop=True)
+            ops.append((OP_LOOP, (count, len(body)), delay + carry))
+            ops.extend(body)
+            carry = 0.0
+            i += 1 + length
+            continue
+        if op == OP_WRITE and _is_char(args[0]):
+            while j < total and plan[j][0] == OP_WRITE and _is_char(plan[j][1][0]) and plan[j][2] <= threshold:
+                j += 1
+        elif op == OP_CLICK:
+            while j < total and plan[j][0] == OP_CLICK and plan[j][1] == args and plan[j][2] <= threshold:
+                j += 1
+
+        delay += carry
+        carry = 0.0
+        if j - i > 1:
+            inner = sum(plan[k][2] for k in range(i + 1, j))
+            interval = inner / (j - i - 1)
+            if op == OP_WRITE:
+                ops.append((OP_WRITE, (''.join(plan[k][1][0] for k in range(i, j)), interval), delay))
+            else:
+                ops.append((OP_CLICK, (args[0], args[1], j - i, interval), delay))
+            carry = inner
+        else:
+            ops.append((op, args, delay))
+        i = j
+    if carry and in_loop:
+        ops.append((OP_NONE, (), carry))
+    return tuple(ops)
+
+def coalesce_stats(before, after, pause):
+    # pause is the backend's per-call overhead (pyautogui.PAUSE)
+    calls_before, delays = plan_totals(before)
+    calls_after, _ = plan_totals(after)
+    before_time = delays + calls_before * pause
+    after_time = delays + calls_after * pause
+    return {
+        'calls_before': calls_before,
+        'calls_after': calls_after,
+        'saved_s': before_time - after_time,
+        'speedup': before_time / after_time if after_time else 1.0,
+    }
+
+# Speed and gap cap. Gaps longer than max_gap seconds are cut to max_gap before compiling, so
+# glides shrink with them, then every time in the plan is divided by speed. Both can be set
+# per run (PlaybackEngine) and per ActionList; speeds multiply and the smaller cap wins.
+# pyautogui still sleeps PAUSE after each call whatever the speed, see estimate_duration().
+DEFAULT_PAUSE = 0.1  # pyautogui.PAUSE unless the backend says otherwise
+
+def parse_speed(text):
+    speed = float(text)
+    if not speed > 0 or math.isinf(speed):
+        raise ValueError(f"Speed must be a positive number, got {text!r}")
+    return speed
+
+def parse_max_gap(text):
+    # Blank means no cap
+    if text is None or str(text).strip() == '':
+        return None
+    max_gap = float(text)
+    if not max_gap >= 0 or math.isinf(max_gap):
+        raise ValueError(f"Max gap must be a non-negative number of seconds, got {text!r}")
+    return max_gap
+
+def combine_speed(run_speed, list_speed):
+    return (run_speed or 1.0) * (list_speed or 1.0)
+
+def combine_max_gap(run_gap, list_gap):
+    gaps = [gap for gap in (run_gap, list_gap) if gap is not None]
+    return min(gaps) if gaps else None
+
+def cap_gaps(actions, max_gap):
+    for action_type, action_detail, delay in actions:
+        yield (action_type, action_detail, min(delay, max_gap))
+
+def _scale_args(op, args, speed):
+    # Times spent inside a call: glides, drag paths and coalesced intervals
+    if op == OP_MOVE:
+        return (args[0], args[1], args[2] / speed)
+    if op == OP_DRAG:
+        return (tuple((x, y, glide / speed) for x, y, glide in args[0]),)
+    if op == OP_CLICK and len(args) == 4:
+        return (args[0], args[1], args[2], args[3] / speed)
+    if op == OP_WRITE and len(args) == 2:
+        return (args[0], args[1] / speed)
+    return args
+
+def scale_plan(plan, speed=1.0):
+    if speed == 1.0:
+        return plan
+    return tuple((op, _scale_args(op, args, speed), delay / speed) for op, args, delay in plan)
+
+def plan_duration(plan, pause=DEFAULT_PAUSE):
+    # Expected seconds for one pass: the scheduled delays plus the backend's pause after every call.
+    # Waits are counted as if the screen were ready straight away.
+    calls, seconds = plan_totals(plan)
+    return seconds + calls * pause
+
+def estimate_duration(actions, speed=1.0, max_gap=None, pause=DEFAULT_PAUSE, special_keys=SPECIAL_KEYS):
+    if max_gap is not None:
+        actions = cap_gaps(actions, max_gap)
+    return plan_duration(scale_plan(compile_actions(actions, special_keys), speed), pause)
+
+def format_coalesce(stats):
+    return (f"{stats['calls_before']} -> {stats['calls_after']} input calls, "
+            f"~{stats['saved_s']:.2f} s saved per pass ({stats['speedup']:.1f}x)")
+
+class ActionList:
+    __slots__ = ('name', '_actions', 'repeat', 'sequence', 'interval', 'last_executed', 'executed', 'active', 'speed', 'max_gap')
+
+    def __init__(self, name, sequence=0, interval=0, active=True):
+        self.name = name
+        self.actions = ActionColumns()
+        self.repeat = 1
+        self.sequence = sequence
+        self.interval = interval
+        self.last_executed = 0
+        self.executed = 0
+        self.active = active
+        self.speed = 1.0
+        self.max_gap = None  # Seconds, None leaves every gap as recorded
+
+    @property
+    def actions(self):
+        return self._actions
+
+    @actions.setter
+    def actions(self, actions):
+        # Lists, tuples and iterators are packed into columns. Other sequences, such as another
+        # ActionColumns or the mapped view of a binary recording, are kept as they are.
+        if isinstance(actions, (list, tuple)) or not isinstance(actions, Sequence):
+            actions = ActionColumns(actions)
+        self._actions = actions
+
+    def add_action(self, action):
+        self.actions.append(action)
+
+    def remove_action(self, index):
+        del self.actions[index]
+
+    def clear_actions(self):
+        self.actions.clear()
+
+    def compile(self, special_keys=SPECIAL_KEYS):
+        return compile_actions(self.actions, special_keys)
+
+def action_list_from_item(item, i):
+    # One saved action list, i its position in the file; shared with the streaming importer
+    if not isinstance(item, dict):
+        raise ValueError("Invalid item format: expected a dictionary")
+
+    name = item.get('name', f"Recording_{i + 1}")
+    sequence = item.get('sequence', i)
+    interval = item.get('interval', 0)
+    repeat = item.get('repeat', 1)
+    actions = item.get('actions')
+
+    if not all(isinstance(x, (str, int)) for x in [name, sequence, interval, repeat]):
+        raise ValueError("Invalid data types for action list properties")
+    if not isinstance(actions, list):
+        raise ValueError("Invalid actions format: expected a list")
+
+    action_list = ActionList(name, sequence, interval, item.get('active', True))
+    action_list.actions = actions
+    action_list.repeat = repeat
+    action_list.speed = parse_speed(item.get('speed', 1.0))
+    action_list.max_gap = parse_max_gap(item.get('max_gap'))
+    return action_list
+
+def parse_action_lists(data):
+    # Accepts a saved replay (list of action lists), a cron job file, or a single exported recording
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        raise ValueError("Invalid file format: expected a list of action lists")
+    return [action_list_from_item(item, i) for i, item in enumerate(data)]
+
+def load_action_lists(file_path):
+    # *.aar files are the binary format from recording_format, anything else is JSON
+    from recording_format import is_binary_path, load_binary
+    if is_binary_path(file_path):
+        return load_binary(file_path)
+    with open(file_path, 'r') as file:
+        return parse_action_lists(json.load(file))
+
+class StatusSlot:
+    # Latest progress published by a playback thread, read by the UI at its own rate.
+    # publish() only swaps a reference, so nothing queues up however fast actions play
+    # and a reader sees each value at most once.
+    def __init__(self):
+        self.latest = None
+        self.seen = None
+
+    def publish(self, value):
+        self.latest = value
+
+    def take(self):
+        # The newest value if it changed since the last take(), otherwise None
+        value = self.latest
+        if value is self.seen:
+            return None
+        self.seen = value
+        return value
+
+class PlaybackEngine:
+    # running and paused may be set from any thread. Setting either wakes the playback thread
+    # straight away, also in the middle of a long delay, through the condition below.
+    def __init__(self, backend=None, special_keys=SPECIAL_KEYS):
+        self._backend = backend
+        self.special_keys = special_keys
+        self.condition = threading.Condition()
+        self._running = False
+        self._paused = False
+        # perf_counter of the last running/paused change, and how long the playback thread
+        # took to act on it (None until a playing engine has seen a change)
+        self.signalled_at = None
+        self.last_signal_latency = None
+        self.repeat_count = 0
+        self.last_timing = None
+        # Coalescing threshold in seconds, None leaves every action as its own input call
+        self.coalesce = None
+        self.last_coalesce = None
+        # Run level speed factor and gap cap, combined with each list's own
+        self.speed = 1.0
+        self.max_gap = None
+        # Expected and measured seconds of the last play_action_list(), pauses excluded
+        self.last_estimate = None
+        self.last_duration = None
+        # MetricsRegistry every play_action_list() run is merged into, None skips the per action timing
+        self.metrics = None
+        self.last_metrics = None
+        # Seconds between probes of a wait action, how many waits of the last play_action_list()
+        # failed (timed out or errored), the opcode name of a failed 'stop' wait that ended it,
+        # and the error of the last wait whose probe raised
+        self.poll_interval = POLL_INTERVAL
+        self.wait_timeouts = 0
+        self.stopped_by_wait = None
+        self.last_wait_error = None
+
+    @property
+    def backend(self):
+        # pyautogui talks to the display as soon as it is imported, so defer it until the first action
+        if self._backend is None:
+            import pyautogui
+            self._backend = pyautogui
+        return self._backend
+
+    @property
+    def running(self):
+        return self._running
+
+    @running.setter
+    def running(self, value):
+        self.signal('_running', value)
+
+    @property
+    def paused(self):
+        return self._paused
+
+    @paused.setter
+    def paused(self, value):
+        self.signal('_paused', value)
+
+    def signal(self, name, value):
+        with self.condition:
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                self.signalled_at = time.perf_counter()
+                self.condition.notify_all()
+
+    def stop(self):
+        with self.condition:
+            self._running = False
+            self._paused = False
+            self.signalled_at = time.perf_counter()
+            self.condition.notify_all()
+
+    def acknowledge(self):
+        # Called by the playback thread once it has acted on a stop, pause or resume
+        if self.signalled_at is not None:
+            self.last_signal_latency = time.perf_counter() - self.signalled_at
+
+    def wait_until(self, deadline):
+        # Waits for deadline on perf_counter. Returns False as soon as playback is paused or
+        # stopped, True once the deadline has passed. The last SPIN_THRESHOLD is spun out.
+        if deadline - time.perf_counter() > SPIN_THRESHOLD:
+            with self.condition:
+                while self._running and not self._paused:
+                    remaining = deadline - time.perf_counter() - SPIN_THRESHOLD
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+        if not self._running or self._paused:
+            return False
+        while time.perf_counter() < deadline:
+            pass
+        return True
+
+    def wait_resumed(self):
+        # Blocks while paused, returns the seconds spent waiting
+        self.acknowledge()
+        paused_at = time.perf_counter()
+        with self.condition:
+            while self._paused and self._running:
+                self.condition.wait()
+        self.acknowledge()
+        return time.perf_counter() - paused_at
+
+    def wait_for(self, probe, args, timeout, timeline=None, metrics=None):
+        # Probes every poll_interval until probe(*args) is true or timeout seconds have passed,
+        # time spent paused not counted. Returns True or False, None when playback was stopped.
+        # A probe that raises (missing template, template larger than the region) fails the
+        # wait straight away, the error is kept in last_wait_error. Pauses shift the timeline
+        # and are observed in metrics like those between actions.
+        limit = time.perf_counter() + timeout
+        while True:
+            try:
+                if probe(*args):
+                    return True
+            except Exception as e:
+                self.last_wait_error = e
+                return False
+            now = time.perf_counter()
+            if now >= limit:
+                return False
+            if not self.wait_until(min(limit, now + self.poll_interval)):
+                if not self._running:
+                    return None
+                paused_for = self.wait_resumed()
+                limit += paused_for
+                if timeline is not None:
+                    timeline.shift(paused_for)
+                if metrics is not None:
+                    metrics.observe_pause(paused_for)
+
+    def handlers(self):
+        # Dispatch table indexed by opcode
+        backend = self.backend
+
+        def drag(path):
+            if len(path) == 1:
+                x, y, glide = path[0]
+                backend.dragTo(x, y, glide, button='left')
+                return
+            backend.mouseDown(button='left')
+            try:
+                for x, y, glide in path:
+                    backend.moveTo(x, y, glide)
+            finally:
+                backend.mouseUp(button='left')
+
+        def scroll(dx, dy):
+            if dy:
+                backend.scroll(dy * SCROLL_SCALE)
+            if dx:
+                backend.hscroll(dx * SCROLL_SCALE)
+
+        def image_shown(path, region):
+            return find_image(backend, path, region) is not None
+
+        def pixel_matches(region, target):
+            return region_matches(backend, region, target)
+
+        return (lambda: None, backend.click, backend.press, backend.write, backend.moveTo, drag, scroll, None,
+                image_shown, pixel_matches)
+
+    def play_actions(self, plan, on_action=None, timeline=None, metrics=None):
+        # Plays a compiled plan (raw action lists are compiled first).
+        # Returns False when playback was stopped part way through.
+        # metrics, a ListMetrics, gets every action's lateness and call time and every pause.
+        if not isinstance(plan, tuple):
+            plan = compile_actions(plan, self.special_keys)
+        handlers = self.handlers()
+        timeline = timeline or Timeline()
+        total = plan_totals(plan)[0] if on_action else 0
+        loops = []  # [first op of the body, op after the body, passes left] per open OP_LOOP
+        played = 0
+        i = 0
+        end = len(plan)
+        while i < end:
+            op, args, delay = plan[i]
+            deadline = timeline.next_deadline(delay)
+            i += 1
+            if op == OP_LOOP:
+                # Nothing to send, the delay is waited out with the body's first op
+                count, length = args
+                if count < 1 or length < 1:
+                    # An empty body would never reach its end, so it cannot be looped
+                    i += length
+                elif count > 1:
+                    loops.append([i, i + length, count - 1])
+            else:
+                while not self.wait_until(deadline):
+                    if not self._running:
+                        self.acknowledge()
+                        return False
+                    # Paused part way into the delay, the rest of it is waited after resuming
+                    paused_for = self.wait_resumed()
+                    timeline.shift(paused_for)
+                    deadline += paused_for
+                    if metrics is not None:
+                        metrics.observe_pause(paused_for)
+                timeline.record(deadline)
+                if op >= OP_WAIT_IMAGE:
+                    started = time.perf_counter()
+                    origin = timeline.origin
+                    shown = self.wait_for(handlers[op], args[:-2], args[-2], timeline, metrics)
+                    if shown is None:
+                        self.acknowledge()
+                        return False
+                    if not shown:
+                        self.wait_timeouts += 1
+                        if args[-1] == 'stop':
+                            self.stopped_by_wait = OP_NAMES[op]
+                            self.stop()
+                            return False
+                    # Pauses during the wait already moved the origin
+                    waited = time.perf_counter() - started - (timeline.origin - origin)
+                    timeline.add_wait(waited)
+                    if metrics is not None:
+                        metrics.observe(OP_NAMES[op], timeline.last_lateness, waited)
+                elif metrics is None:
+                    handlers[op](*args)
+                else:
+                    started = time.perf_counter()
+                    handlers[op](*args)
+                    metrics.observe(OP_NAMES[op], timeline.last_lateness, time.perf_counter() - started)
+                played += 1
+                if on_action:
+                    on_action(played, total)
+            while loops and i == loops[-1][1]:
+                if loops[-1][2]:
+                    loops[-1][2] -= 1
+                    i = loops[-1][0]
+                    break
+                loops.pop()
+        return self._running
+
+    def play_action_list(self, action_list, repeat=None, on_action=None, on_cycle=None):
+        # repeat defaults to the list's own setting, 0 repeats until stopped.
+        # The list is compiled once per run, so edits made while it plays apply to the next run.
+        # All repeats share one timeline so they cannot drift against each other either.
+        if repeat is None:
+            repeat = action_list.repeat
+        speed = combine_speed(self.speed, getattr(action_list, 'speed', 1.0))
+        max_gap = combine_max_gap(self.max_gap, getattr(action_list, 'max_gap', None))
+        pause = getattr(self.backend, 'PAUSE', 0.0)
+        actions = action_list.actions if max_gap is None else cap_gaps(action_list.actions, max_gap)
+        plan = compile_actions(actions, self.special_keys)
+        # Coalescing sees capped but unscaled delays, its threshold stays in recorded time
+        if self.coalesce is not None:
+            coalesced = coalesce_plan(plan, self.coalesce)
+            self.last_coalesce = coalesce_stats(plan, coalesced, pause)
+            plan = coalesced
+        plan = scale_plan(plan, speed)
+        # Per pass when repeating until stopped
+        self.last_estimate = plan_duration(plan, pause) * (repeat or 1)
+        metrics = ListMetrics() if self.metrics is not None else None
+        timeline = Timeline()
+        self.repeat_count = 0
+        self.wait_timeouts = 0
+        self.stopped_by_wait = None
+        self.last_wait_error = None
+        while self.running and (repeat == 0 or self.repeat_count < repeat):
+            if on_action:
+                self.play_actions(plan, lambda current, total: on_action(action_list, current, total), timeline, metrics)
+            else:
+                self.play_actions(plan, timeline=timeline, metrics=metrics)
+            if not self.running:
+                break
+            self.repeat_count += 1
+            if on_cycle:
+                on_cycle(action_list, self.repeat_count)
+        self.last_timing = timeline.summary()
+        # The origin moved forward by every pause, so this is time spent playing
+        self.last_duration = time.perf_counter() - timeline.origin
+        if metrics is not None:
+            metrics.runs = 1
+            self.metrics.add(action_list.name, metrics)
+        self.last_metrics = metrics
+        return self.running
+
+    def run_replay(self, action_lists, cycles=1, on_action=None, on_cycle=None, on_list_done=None, on_full_cycle=None):
+        # cycles: full passes over the lists, 0 repeats until stopped.
+        # A callable is asked after every pass whether to go again.
+        full_cycles = 0
+        while self.running:
+            for action_list in sorted(action_lists, key=lambda x: x.sequence):
+                if not self.running:
+                    break
+
+                if not action_list.active:
+                    continue  # Skip inactive items
+
+                current_time = time.time()
+
+                if (action_list.executed == 0 or
+                    action_list.interval == 0 or
+                    current_time >= action_list.last_executed + (action_list.interval * 60)):
+
+                    self.play_action_list(action_list, on_action=on_action, on_cycle=on_cycle)
+
+                    action_list.last_executed = time.time()
+                    action_list.executed += 1
+                    if on_list_done:
+                        on_list_done(action_list)
+                else:
+                    print(f"Skipping {action_list.name} due to interval not met")
+
+            full_cycles += 1
+            if on_full_cycle:
+                on_full_cycle(full_cycles)
+
+            if callable(cycles):
+                if not cycles():
+                    break
+            elif cycles and full_cycles >= cycles:
+                break
+        return full_cycles
+
+def play_file(file_path, repeat=1, engine=None, coalesce=None, speed=1.0, max_gap=None, metrics_path=None,
+              poll_interval=POLL_INTERVAL):
+    action_lists = load_action_lists(file_path)
+    engine = engine or PlaybackEngine()
+    engine.coalesce = coalesce
+    engine.speed = speed
+    engine.max_gap = max_gap
+    engine.poll_interval = poll_interval
+    if metrics_path:
+        engine.metrics = MetricsRegistry()
+
+    def on_list_done(action_list):
+        print(f"Played {action_list.name} ({len(action_list.actions)} actions), {format_timing(engine.last_timing)}")
+        print(f"  duration: est. {format_duration(engine.last_estimate)}, actual {format_duration(engine.last_duration)}")
+        if engine.coalesce is not None:
+            print(f"  coalesced: {format_coalesce(engine.last_coalesce)}")
+        if engine.wait_timeouts:
+            print(f"  {engine.wait_timeouts} wait(s) timed out")
+        if engine.last_wait_error is not None:
+            print(f"  wait failed: {engine.last_wait_error}")
+        if engine.stopped_by_wait:
+            print(f"  stopped: {engine.stopped_by_wait} wait failed")
+
+    engine.running = True
+    try:
+        return engine.run_replay(
+            action_lists,
+            cycles=repeat,
+            on_list_done=on_list_done,
+            on_full_cycle=lambda count: print(f"Full cycles: {count}"),
+        )
+    finally:
+        engine.stop()
+        if metrics_path:
+            # Also written when interrupted, a stopped run is often the one worth looking at
+            write_metrics(metrics_path, engine.metrics)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m engine", description="Play saved recordings and replays without the GUI.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    play_parser = subparsers.add_parser('play', help="Play a saved replay or recording JSON file")
+    play_parser.add_argument('file', help="Replay, cron job or recording JSON file, or a binary .aar recording")
+    play_parser.add_argument('--repeat', type=int, default=1, help="Full passes over the file (0 = until interrupted)")
+    play_parser.add_argument('--coalesce', type=float, nargs='?', const=COALESCE_THRESHOLD * 1000, metavar='MS',
+                             help=f"Batch typed keys and repeated clicks closer than MS milliseconds (default {COALESCE_THRESHOLD * 1000:.0f})")
+    play_parser.add_argument('--speed', default='1', help="Playback speed factor, 2 plays twice as fast (default 1)")
+    play_parser.add_argument('--max-gap', default='', metavar='SECONDS', help="Cut longer pauses between actions down to SECONDS")
+    play_parser.add_argument('--poll', type=float, default=POLL_INTERVAL * 1000, metavar='MS',
+                             help=f"Check the screen every MS milliseconds during wait actions (default {POLL_INTERVAL * 1000:.0f})")
+    play_parser.add_argument('--metrics', metavar='FILE', help="Write per action timing histograms to FILE (*.json, otherwise Prometheus text)")
+
+    args = parser.parse_args(argv)
+    if args.repeat < 0:
+        parser.error("--repeat must be a non-negative integer")
+    if not args.poll > 0:
+        parser.error("--poll must be a positive number of milliseconds")
+    try:
+        speed = parse_speed(args.speed)
+        max_gap = parse_max_gap(args.max_gap)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        play_file(args.file, repeat=args.repeat, coalesce=None if args.coalesce is None else args.coalesce / 1000,
+                  speed=speed, max_gap=max_gap, metrics_path=args.metrics, poll_interval=args.poll / 1000)
+    except KeyboardInterrupt:
+        print("Playback interrupted.")
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"Failed to play {args.file}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import json
+
+from action_columns import ActionColumns
+from engine import action_list_from_item, parse_max_gap, parse_speed
+
+# Incremental import of replay and cron job files. Top level items are parsed one at a time
+# from a growing read buffer, validated straight away, and their actions packed into
+# ActionColumns, so neither the whole file text nor every action tuple is held at once.
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = ' \t\n\r'
+
+def iter_json_array(file, chunk_size=CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    exhausted = False
+
+    def refill(size):
+        nonlocal buffer, position, exhausted
+        more = file.read(size)
+        if not more:
+            exhausted = True
+            return False
+        buffer = buffer[position:] + more
+        position = 0
+        return True
+
+    def skip_whitespace():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            if position < len(buffer) or not refill(chunk_size):
+                return
+
+    skip_whitespace()
+    if position >= len(buffer) or buffer[position] != '[':
+        raise ValueError("Invalid file format: expected a list")
+    position += 1
+
+    first = True
+    while True:
+        skip_whitespace()
+        if position >= len(buffer):
+            raise ValueError("Invalid file format: list is not closed")
+        if buffer[position] == ']':
+            return
+        if not first:
+            if buffer[position] != ',':
+                raise ValueError("Invalid file format: expected ',' between items")
+            position += 1
+            skip_whitespace()
+        first = False
+
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                # A bare number ending exactly at the buffer end may continue in the next chunk
+                if end < len(buffer) or exhausted or not refill(chunk_size):
+                    break
+                continue
+            except json.JSONDecodeError:
+                # Item runs past the buffer: read at least as much again, so a huge item is
+                # re-parsed a logarithmic number of times rather than once per chunk
+                if exhausted or not refill(max(chunk_size, len(buffer) - position)):
+                    raise
+        position = end
+        yield item
+
+def cron_job_from_item(item):
+    if not isinstance(item, dict):
+        raise ValueError("Invalid item format: expected a dictionary")
+    if not isinstance(item.get('actions'), list):
+        raise ValueError("Invalid actions format: expected a list")
+    return {
+        'name': item['name'],
+        'actions': ActionColumns(item['actions']),
+        'cron_expression': item['cron_expression'],
+        'time': item.get('time', item['cron_expression']),  # Show the expression if no time string is present
+        'active': item.get('active', True),
+        'last_executed': item.get('last_executed', '-'),
+        'overlap': item.get('overlap', 'queue'),
+        'speed': parse_speed(item.get('speed', 1.0)),
+        'max_gap': parse_max_gap(item.get('max_gap'))
+    }
+
+def iter_action_lists(file_path):
+    with open(file_path, 'r') as file:
+        for i, item in enumerate(iter_json_array(file)):
+            yield action_list_from_item(item, i)
+
+def iter_cron_jobs(file_path):
+    with open(file_path, 'r') as file:
+        for item in iter_json_array(file):
+            yield cron_job_from_item(item)
@@ -0,0 +1,127 @@
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from engine import ActionList
+from recording_format import PAIR_OPCODES, load_binary, save_binary
+
+# Append-only journal of a recording in progress, one JSON line per action after a
+# {"name": ...} header. append() only queues the line; a writer thread writes and fsyncs
+# the queue every FLUSH_INTERVAL seconds, or as soon as BATCH_SIZE lines are waiting, so a
+# slow disk never stalls the Tk thread. A journal stays on disk until its recording has been
+# saved, and a crash or a forced exit loses at most the last FLUSH_INTERVAL of actions plus
+# whatever the disk had not synced yet.
+
+JOURNAL_DIR = 'journal'
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 0.5
+
+class RecordingJournal:
+    def __init__(self, name, directory=JOURNAL_DIR, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        os.makedirs(directory, exist_ok=True)
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+        self.path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_name}.jsonl")
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.pending = [json.dumps({'name': name})]  # Lines not yet handed to the writer
+        self.condition = threading.Condition()
+        self.closed = False
+        self.error = None
+        self.writer = threading.Thread(target=self.write_batches, name="journal-writer", daemon=True)
+        self.writer.start()
+
+    def append(self, action):
+        action_type, action_detail, delay = action
+        line = json.dumps([action_type, action_detail, delay])
+        self.count += 1
+        with self.condition:
+            self.pending.append(line)
+            if len(self.pending) >= self.batch_size:
+                self.condition.notify()
+
+    def write_batches(self):
+        while True:
+            with self.condition:
+                if not self.closed and len(self.pending) < self.batch_size:
+                    self.condition.wait(self.flush_interval)
+                lines, self.pending = self.pending, []
+                closed = self.closed
+            if lines and self.error is None:
+                try:
+                    self.file.write('\n'.join(lines) + '\n')
+                    self.file.flush()
+                    os.fsync(self.file.fileno())
+                except OSError as e:
+                    # The recording itself goes on, only its crash copy is incomplete
+                    self.error = e
+                    logging.error(f"Could not write journal {self.path}: {str(e)}")
+            if closed:
+                return
+
+    def close(self):
+        # Waits for the writer's last batch, the journal is complete on disk afterwards
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.writer.join()
+        self.file.close()
+
+    def compact(self):
+        return compact_journal(self.path)
+
+def read_journal(path):
+    # Returns (name, actions generator). A line cut short by a crash ends the journal.
+    with open(path, 'r', encoding='utf-8') as file:
+        header = json.loads(file.readline())
+
+    def actions():
+        with open(path, 'r', encoding='utf-8') as file:
+            file.readline()
+            for line in file:
+                try:
+                    action_type, action_detail, delay = json.loads(line)
+                except ValueError:
+                    logging.warning(f"Journal {path} ends with an incomplete entry")
+                    return
+                yield (action_type, tuple(action_detail) if action_type in PAIR_OPCODES else action_detail, delay)
+
+    return header.get('name', os.path.basename(path)), actions()
+
+def compact_journal(path):
+    # Streams the journal into a binary recording next to it and maps that back in, so even a
+    # very long recording is never held in memory as Python tuples
+    name, actions = read_journal(path)
+    source = ActionList(name)
+    source.actions = actions
+    binary_path = os.path.splitext(path)[0] + '.aar'
+    save_binary(binary_path, [source])
+    return load_binary(binary_path)[0]
+
+def pending_journals(directory=JOURNAL_DIR):
+    return sorted(glob.glob(os.path.join(directory, '*.jsonl')))
+
+def remove_orphans(directory=JOURNAL_DIR):
+    # Compacted .aar files whose journal is gone, left behind when removing them failed
+    # (on Windows a file cannot be deleted while it is still mapped)
+    for binary_path in glob.glob(os.path.join(directory, '*.aar')):
+        if not os.path.exists(os.path.splitext(binary_path)[0] + '.jsonl'):
+            try:
+                os.remove(binary_path)
+            except OSError as e:
+                logging.error(f"Could not remove journal file {binary_path}: {str(e)}")
+
+def discard_journal(path):
+    for file_path in (path, os.path.splitext(path)[0] + '.aar'):
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Could not remove journal file {file_path}: {str(e)}")
@@ -0,0 +1,125 @@
+from action_columns import ActionColumns
+
+# Loop blocks inside ActionList.actions. A ('repeat', (count, length), delay) action plays the
+# `length` actions after it `count` times. Its own delay is waited once before the first pass,
+# the body's first delay before every pass. Blocks nest, a body may contain further repeats.
+#
+# compress_actions() finds back-to-back repetitions of the same actions and folds them into
+# such blocks; the engine plays them without unrolling (see compile_actions()).
+
+MAX_PERIOD = 64  # Longest block, in actions, the compressor looks for
+DELAY_TOLERANCE = 0.25  # Seconds two passes may differ per action and still count as the same block
+
+def read_block(actions, limit=None):
+    # Reads up to limit actions (all when None) from an iterator into (action, body) pairs,
+    # body being the nested pairs of a repeat and None otherwise. Returns (pairs, actions read).
+    pairs = []
+    consumed = 0
+    while limit is None or consumed < limit:
+        action = next(actions, None)
+        if action is None:
+            break
+        consumed += 1
+        if action[0] == 'repeat':
+            body, used = read_block(actions, action[1][1])
+            consumed += used
+            pairs.append((action, body))
+        else:
+            pairs.append((action, None))
+    return pairs, consumed
+
+def expand_actions(actions):
+    # Unrolls every loop block into a flat list of actions
+    def expand(pairs):
+        for (action_type, action_detail, delay), body in pairs:
+            if body is None:
+                yield (action_type, action_detail, delay)
+                continue
+            inner = list(expand(body))
+            for n in range(action_detail[0]):
+                for k, (inner_type, inner_detail, inner_delay) in enumerate(inner):
+                    # The block's own delay comes once, in front of the first pass
+                    yield (inner_type, inner_detail, inner_delay + delay if n == 0 and k == 0 else inner_delay)
+    return list(expand(read_block(iter(actions))[0]))
+
+def _token_key(action_type, action_detail):
+    try:
+        hash(action_detail)
+        return (action_type, action_detail)
+    except TypeError:
+        return (action_type, repr(action_detail))
+
+def _lead_delay(actions):
+    # Delay in front of the first real action, including that of any repeats opening the block
+    total = 0.0
+    for action_type, _, delay in actions:
+        total += delay
+        if action_type != 'repeat':
+            break
+    return total
+
+def _same_delays(delays, reference, start, period, first):
+    # The body's first delay is the pause between passes, it is checked against the second pass
+    if abs(delays[start] - delays[first]) > DELAY_TOLERANCE:
+        return False
+    for k in range(1, period):
+        if abs(delays[start + k] - delays[reference + k]) > DELAY_TOLERANCE:
+            return False
+    return True
+
+def _compress(actions, max_period):
+    count = len(actions)
+    ids = {}
+    tokens = [ids.setdefault(_token_key(action_type, action_detail), len(ids)) for action_type, action_detail, _ in actions]
+    delays = [delay for _, _, delay in actions]
+
+    # next_same[i] is the next position holding the same action as i, the only periods worth trying
+    next_same = [count] * count
+    seen = {}
+    for i in range(count - 1, -1, -1):
+        next_same[i] = seen.get(tokens[i], count)
+        seen[tokens[i]] = i
+
+    out = []
+    i = 0
+    while i < count:
+        best = None  # (actions saved, period, passes)
+        j = next_same[i]
+        while j < count and j - i <= max_period:
+            period = j - i
+            body = tokens[i:j]
+            passes = 1
+            start = j
+            while start + period <= count and tokens[start:start + period] == body and _same_delays(delays, i, start, period, i + period):
+                passes += 1
+                start += period
+            saved = (passes - 1) * period - 1
+            if passes > 1 and saved > 0 and (best is None or saved > best[0]):
+                best = (saved, period, passes)
+            j = next_same[j]
+
+        if best is None:
+            out.append(actions[i])
+            i += 1
+            continue
+
+        _, period, passes = best
+        # Each body action gets the mean delay of its passes, the first one over passes 2..n only
+        body = []
+        for k in range(period):
+            first_pass = 1 if k == 0 else 0
+            samples = [delays[i + n * period + k] for n in range(first_pass, passes)]
+            action_type, action_detail, _ = actions[i + k]
+            body.append((action_type, action_detail, sum(samples) / len(samples)))
+        body = _compress(body, max_period)
+        out.append(('repeat', (passes, len(body)), max(0.0, delays[i] - _lead_delay(body))))
+        out.extend(body)
+        i += period * passes
+    return out
+
+def compress_actions(actions, max_period=MAX_PERIOD):
+    # Returns ActionColumns with repeated runs folded into loop blocks. Existing blocks are
+    # unrolled first, so compressing twice gives the same result as compressing once.
+    flat = [(action_type, tuple(action_detail) if isinstance(action_detail, list) else action_detail, float(delay))
+            for action_type, action_detail, delay in expand_actions(actions)]
+    return ActionColumns(_compress(flat, max_period))
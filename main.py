@@ -1,56 +1,183 @@
 import os
 from datetime import datetime
-import croniter
 import json
 import tkinter as tk
 from tkinter import filedialog, simpledialog, messagebox
 from tkinter import ttk
-from pynput import mouse, keyboard
-import pyautogui
 import threading
 import time
-import re
-from collections import deque
+import queue
 import logging
-import functools
-
-def debounce(wait):
-    def decorator(fn):
-        def debounced(*args, **kwargs):
-            def call_it():
-                fn(*args, **kwargs)
+from widgets import VirtualTreeview
+from capture import DRAIN_INTERVAL, DelayClock, EventRing, MotionSimplifier
+from cron_scheduler import CronRunManager, CronScheduler, OVERLAP_POLICIES, day_order_key, parse_schedule
+from importer import iter_action_lists, iter_cron_jobs
+from loops import compress_actions
+from metrics import MetricsRegistry, write_metrics
+from timers import TkScheduler, debounce, throttle
+from journal import RecordingJournal, compact_journal, discard_journal, pending_journals, remove_orphans
+from recording_format import RECORDING_FILETYPES, BinaryActions, is_binary_path, load_binary, save_binary
+from action_columns import ActionColumns
+from engine import (ActionList, PlaybackEngine, SPECIAL_KEYS, StatusSlot, COALESCE_THRESHOLD, WAIT_POLICIES, compile_actions,
+                    estimate_duration, format_coalesce, format_duration, format_timing, parse_max_gap, parse_speed)
+
+# While a recording is journaled to disk the record tab only keeps this many of the newest rows
+RECORD_TREE_WINDOW = 1000
+
+# How often a streaming import hands parsed entries to the UI, in ms
+IMPORT_POLL_INTERVAL = 50
+
+# Playback progress is shown at this rate, in ms (about 30 Hz), however fast the actions play
+STATUS_INTERVAL = 33
+
+# Pause toggles closer together than this are dropped, a held End key repeats
+PAUSE_TOGGLE_GUARD = 0.3
+
+# Debounced handlers run this long after the last of a burst of clicks or hotkey presses
+DEBOUNCE_WAIT = 0.3
+
+# pynput takes a while to import and to hook the input devices, so it is loaded off the Tk thread
+# once the window is up (see ActionRecorder.start_listeners). Anything using these calls load_pynput() first.
+mouse = keyboard = None
+
+def load_pynput():
+    global mouse, keyboard
+    if mouse is None:
+        from pynput import keyboard as pynput_keyboard, mouse as pynput_mouse
+        mouse, keyboard = pynput_mouse, pynput_keyboard
+
+# Text shown for an action in the trees and accepted back by the editors
+ACTION_PREFIXES = (
+    ('click', "Click at "),
+    ('move', "Move to "),
+    ('drag', "Drag to "),
+    ('scroll', "Scroll "),
+    ('repeat', "Repeat "),  # (passes, actions in the block)
+    ('image', "Wait for image "),  # (template path, (left, top, width, height) or None, timeout s[, on timeout])
+    ('pixel', "Wait for pixel "),  # ((x, y) or (left, top, width, height), '#rrggbb' or 'crc32:...', timeout s, on timeout)
+)
+
+# Accepted field counts of the tuple after each prefix, two unless listed
+ACTION_FIELDS = {'image': (3, 4), 'pixel': (4,)}
+WAIT_ACTIONS = ('image', 'pixel')
+
+def action_to_string(action_type, action_detail):
+    for prefix_type, prefix in ACTION_PREFIXES:
+        if action_type == prefix_type:
+            return f"{prefix}{tuple(action_detail)}"
+    if action_type == 'key':
+        return f"Key {action_detail}"
+    return f"{action_type} {action_detail}"
+
+def parse_action_string(action_str):
+    for action_type, prefix in ACTION_PREFIXES:
+        if action_str.startswith(prefix):
             try:
-                debounced.t.cancel()
-            except(AttributeError):
-                pass
-            debounced.t = threading.Timer(wait, call_it)
-            debounced.t.start()
-        return debounced
-    return decorator
-
-class ActionList:
-    def __init__(self, name, sequence=0, interval=0, active=True):
-        self.name = name
-        self.actions = []
-        self.repeat = 1
-        self.sequence = sequence
-        self.interval = interval
-        self.last_executed = 0
-        self.executed = 0
-        self.active = active
-
-    def add_action(self, action):
-        self.actions.append(action)
-
-    def remove_action(self, index):
-        del self.actions[index]
-
-    def clear_actions(self):
-        self.actions.clear()
+                coords = eval(action_str.replace(prefix, ""))
+                if not (isinstance(coords, tuple) and len(coords) in ACTION_FIELDS.get(action_type, (2,))):
+                    raise ValueError
+            except:
+                raise ValueError(f"Invalid {action_type} coordinates")
+            if action_type in WAIT_ACTIONS:
+                try:
+                    compile_actions([(action_type, coords, 0.0)])  # Checks region, target and policy
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f"Invalid {action_type} wait: {e}")
+            return action_type, coords
+    if action_str.startswith("Key "):
+        return 'key', action_str.replace("Key ", "")
+    raise ValueError("Invalid action string format")
+
+def parse_region(text, sizes):
+    # Comma separated integers, as many as one of sizes
+    region = tuple(int(value) for value in text.split(','))
+    if len(region) not in sizes or (len(region) == 4 and (region[2] <= 0 or region[3] <= 0)):
+        raise ValueError
+    return region
+
+def ask_wait_action(parent, kind=None):
+    # Asks for a wait action's fields, returns its tree text or None when cancelled
+    if kind is None:
+        kind = simpledialog.askstring("Add Wait", "Wait for (image/pixel):", initialvalue='image', parent=parent)
+        if kind is None:
+            return None
+    if kind not in WAIT_ACTIONS:
+        messagebox.showerror("Invalid Input", f"Wait for must be one of {', '.join(WAIT_ACTIONS)}.", parent=parent)
+        return None
+    try:
+        if kind == 'image':
+            path = filedialog.askopenfilename(parent=parent, title="Image to wait for",
+                                              filetypes=[("Images", "*.png *.bmp *.gif *.jpg *.jpeg"), ("All files", "*.*")])
+            if not path:
+                return None
+            # Checked only here, a template moved later makes the wait fail at playback, not the list unsaveable
+            if not os.path.isfile(path):
+                messagebox.showerror("Invalid Input", f"Image file not found: {path}", parent=parent)
+                return None
+            region_str = simpledialog.askstring("Wait for Image", "Search region as left, top, width, height (blank = whole screen):",
+                                                parent=parent)
+            if region_str is None:
+                return None
+            region = parse_region(region_str, (4,)) if region_str.strip() else None
+        else:
+            region_str = simpledialog.askstring("Wait for Pixel", "Pixel as x, y or a small rectangle as left, top, width, height:",
+                                                parent=parent)
+            if region_str is None:
+                return None
+            region = parse_region(region_str, (2, 4))
+    except ValueError:
+        messagebox.showerror("Invalid Input", "The region needs 2 or 4 integers, with a positive width and height.", parent=parent)
+        return None
+    if kind == 'pixel':
+        target = simpledialog.askstring("Wait for Pixel", "Colour (#rrggbb) or checksum (crc32:...),\nblank = what the screen shows there now:",
+                                        parent=parent)
+        if target is None:
+            return None
+        if not target.strip():
+            try:
+                import pyautogui
+                from vision import describe_region
+                target = describe_region(pyautogui, region if len(region) == 4 else region + (1, 1))
+            except Exception as e:
+                messagebox.showerror("Screen Error", f"Could not read the screen: {str(e)}", parent=parent)
+                logging.error(f"Pixel capture error: {str(e)}")
+                return None
+    timeout = simpledialog.askfloat(f"Wait for {kind.capitalize()}", "Give up after (seconds):", initialvalue=10.0, minvalue=0.0, parent=parent)
+    if timeout is None:
+        return None
+    policy = simpledialog.askstring(f"Wait for {kind.capitalize()}", f"On timeout ({'/'.join(WAIT_POLICIES)}):",
+                                    initialvalue=WAIT_POLICIES[0], parent=parent)
+    if policy is None:
+        return None
+    detail = (path, region, timeout, policy.strip()) if kind == 'image' else (region, target.strip(), timeout, policy.strip())
+    action_str = action_to_string(kind, detail)
+    try:
+        parse_action_string(action_str)
+    except ValueError as e:
+        messagebox.showerror("Invalid Input", str(e), parent=parent)
+        return None
+    return action_str
+
+def tree_actions(tree):
+    # Actions as shown in an edit dialog's tree, raises ValueError on a malformed row
+    actions = ActionColumns()
+    for item in tree.get_children():
+        action_str, delay_str = tree.item(item, 'values')
+        action_type, action_detail = parse_action_string(action_str)
+        actions.append((action_type, action_detail, float(delay_str)))
+    return actions
+
+def estimate_text(tree, speed_text, max_gap_text):
+    try:
+        seconds = estimate_duration(tree_actions(tree), parse_speed(speed_text), parse_max_gap(max_gap_text))
+    except ValueError:
+        return "Est. duration: -"
+    return f"Est. duration: {format_duration(seconds)} per pass"
 
 class ActionRecorder:
     def __init__(self, root):
         self.root = root
+        self.scheduler = TkScheduler(root)  # Debounced methods run on the Tk thread through after()
 
         # Set default window size 
         self.root.geometry("1000x800") # FOR Mac 
@@ -70,47 +197,81 @@ class ActionRecorder:
         self.cron_jobs = []
         self.current_list = None
         self.recording = False
-        self.replaying = False
-        self.paused = False
-        self.last_time = None
-        self.action_repeat_count = 0
+        self.metrics = MetricsRegistry()  # Per action timing of every replay and cron run, see Settings
+        self.engine = PlaybackEngine(special_keys=SPECIAL_KEYS)
+        self.engine.metrics = self.metrics
+        self.cron_scheduler = CronScheduler()
+        self.cron_runs = CronRunManager(special_keys=SPECIAL_KEYS, on_start=self.on_cron_run_start, on_finish=self.on_cron_run_finish)
+        self.cron_runs.metrics = self.metrics
+        self.manual_cron_run = None
+        # Written by the playback threads, drawn by sample_status() on the Tk thread
+        self.replay_status = StatusSlot()  # (list name, action, actions, cycles of the list, full cycles)
+        self.playback_status = StatusSlot()  # Cycle label text of the record tab's playback
+        self.status_job = None
+        self.journal = None
+        self.journals = {}  # ActionList -> journal path, kept until the recording is saved
+        self.events = EventRing()  # Filled by the listener threads, drained on the Tk thread
+        self.clock = None
+        self.motion = None
+        self.drain_job = None
         self.dark_mode = tk.BooleanVar(value=True)  # Set to True by default
-        self.special_keys = [
-            'space',
-                 'enter',
-               'shift',
-                'ctrl',
-                 'alt',
-                 'tab',
-                 'backspace',
-                 'delete',
-                 'esc',
-                 'up',
-                 'down',
-                 'left',
-                 'right',
-                 'home',
-                 'end',
-                 'pageup',
-                 'pagedown'
-        ] 
+        self.listener_mouse = None
+        self.listener_keyboard = None
 
+        self.create_variables()
         self.configure_logging()
         self.configure_styles()
         self.create_widgets()
         self.create_bottom_frame()
-        self.update_move_buttons()  
-
-        self.listener_mouse = mouse.Listener(on_click=self.on_click)
-        self.listener_keyboard = keyboard.Listener(on_press=self.on_press)
-
-        self.listener_mouse.start()
-        self.listener_keyboard.start()
 
         # Apply dark mode by default
         self.toggle_theme()
-        self.root.after(1000, self.check_and_execute_cron_jobs)
-        time.sleep(2)
+        self.cron_scheduler.start(self.on_cron_fire)
+        self.root.after(1000, self.update_current_time)
+        self.root.after(500, self.recover_recordings)
+        threading.Thread(target=self.start_listeners, name="listener-start", daemon=True).start()
+
+    def create_variables(self):
+        # State shown in the Replay, Cron Jobs and Settings tabs is used before those tabs are built
+        self.repeat_all_var = tk.BooleanVar()
+        self.speed_var = tk.StringVar(value="1.0")
+        self.max_gap_var = tk.StringVar(value="")
+        self.cron_order = []  # Original cron_jobs index of every row, sorted by time
+        self.execute_cron_var = tk.BooleanVar(value=True)
+        self.coalesce_var = tk.BooleanVar(value=False)
+        self.cron_workers_var = tk.IntVar(value=self.cron_runs.max_workers)
+        self.journal_var = tk.BooleanVar(value=False)
+        self.motion_var = tk.BooleanVar(value=False)
+        self.compress_var = tk.BooleanVar(value=False)
+        self.metrics_var = tk.BooleanVar(value=True)
+
+    def start_listeners(self):
+        # Runs on its own thread, the hotkeys work as soon as this returns
+        try:
+            load_pynput()
+            self.listener_mouse = mouse.Listener(on_click=self.on_click, on_move=self.on_move, on_scroll=self.on_scroll)
+            self.listener_keyboard = keyboard.Listener(on_press=self.on_press)
+            self.listener_mouse.start()
+            self.listener_keyboard.start()
+        except Exception as e:
+            logging.error(f"Failed to start input listeners: {str(e)}")
+
+    # Playback state lives in the shared engine so the hotkeys and the worker threads see the same flags
+    @property
+    def replaying(self):
+        return self.engine.running
+
+    @replaying.setter
+    def replaying(self, value):
+        self.engine.running = value
+
+    @property
+    def paused(self):
+        return self.engine.paused
+
+    @paused.setter
+    def paused(self, value):
+        self.engine.paused = value
 
     def create_bottom_frame(self):
         self.bottom_frame = ttk.Frame(self.root)
@@ -186,10 +347,28 @@ class ActionRecorder:
         self.notebook.add(self.cron_frame, text="Cron Jobs")  # Add this line
         self.notebook.add(self.settings_frame, text="Settings")
         
+        # Only the Record tab is built up front, the others on first view (or first use, see build_tab)
         self.create_record_widgets()
-        self.create_replay_widgets()
-        self.create_cron_jobs_widgets()
-        self.create_settings_widgets()
+        self.tab_builders = {
+            str(self.replay_frame): (self.create_replay_widgets, self.update_replay_list),
+            str(self.cron_frame): (self.create_cron_jobs_widgets, self.refresh_cron_tree),
+            str(self.settings_frame): (self.create_settings_widgets, self.update_metrics_summary),
+        }
+        self.built_tabs = {str(self.record_frame)}
+        self.notebook.bind('<<NotebookTabChanged>>', lambda event: self.build_tab(self.notebook.select()))
+
+    def build_tab(self, frame):
+        # Builds a tab's widgets if that has not happened yet, then fills them from the current state
+        name = str(frame)
+        if name in self.built_tabs:
+            return
+        self.built_tabs.add(name)
+        create, refresh = self.tab_builders[name]
+        create()
+        refresh()
+
+    def tab_built(self, frame):
+        return str(frame) in self.built_tabs
 
     def create_cron_jobs_widgets(self):
         # Row 0: Top buttons
@@ -206,7 +385,7 @@ class ActionRecorder:
         self.clear_cron_button.pack(side=tk.LEFT, padx=5)
 
         # Row 1: Cron Jobs Tree
-        self.cron_jobs_tree = ttk.Treeview(self.cron_frame, columns=("No.", "Name", "Actions", "Cron Expression", "Active", "Last Executed"), show='headings')
+        self.cron_jobs_tree = VirtualTreeview(self.cron_frame, columns=("No.", "Name", "Actions", "Cron Expression", "Active", "Last Executed"), row_source=self.cron_job_row, on_select=self.on_cron_job_select)
         self.cron_jobs_tree.heading("No.", text="No.")
         self.cron_jobs_tree.heading("Name", text="Name")
         self.cron_jobs_tree.heading("Actions", text="Actions")
@@ -235,7 +414,6 @@ class ActionRecorder:
         button_style.configure('ButtonFrame.TButton', width=20)
 
         # Buttons in the button frame
-        self.execute_cron_var = tk.BooleanVar(value=True)
         self.execute_cron_checkbox = ttk.Checkbutton(button_frame, text="  |   Execute Cron Jobs", variable=self.execute_cron_var)
         self.execute_cron_checkbox.grid(row=0, column=0, padx=5, sticky="ew")
 
@@ -263,17 +441,18 @@ class ActionRecorder:
         self.cron_frame.grid_rowconfigure(1, weight=1)
 
         # Add a horizontal scrollbar
-        h_scroll = ttk.Scrollbar(self.cron_frame, orient="horizontal", command=self.cron_jobs_tree.xview)
+        h_scroll = ttk.Scrollbar(self.cron_frame, orient="horizontal", command=self.cron_jobs_tree.tree.xview)
         h_scroll.grid(row=2, column=0, columnspan=2, sticky="ew")
-        self.cron_jobs_tree.configure(xscrollcommand=h_scroll.set)
+        self.cron_jobs_tree.tree.configure(xscrollcommand=h_scroll.set)
 
-        # Bind selection event to enable/disable buttons
-        self.cron_jobs_tree.bind('<<TreeviewSelect>>', self.on_cron_job_select)
 
+    def selected_cron_index(self):
+        # Rows are sorted by time, map the selected row back to its index in self.cron_jobs
+        row = self.cron_jobs_tree.selected_index()
+        return None if row is None else self.cron_order[row]
 
     def on_cron_job_select(self, event):
-        selected = self.cron_jobs_tree.selection()
-        if selected:
+        if self.selected_cron_index() is not None:
             self.edit_cron_button.config(state=tk.NORMAL)
             self.duplicate_cron_button.config(state=tk.NORMAL)
             self.delete_cron_button.config(state=tk.NORMAL)
@@ -287,79 +466,77 @@ class ActionRecorder:
             self.play_cron_button.config(state=tk.DISABLED)
 
     def play_cron_job(self):
-        selected = self.cron_jobs_tree.selection()
-        if selected:
-            item = selected[0]
-            original_index = int(self.cron_jobs_tree.item(item, 'tags')[0])  # Get the original index from the tag
+        original_index = self.selected_cron_index()
+        if original_index is not None:
             cron_job = self.cron_jobs[original_index]
             
             if self.execute_cron_var.get():
-                self.play_cron_button.config(text="Stop")
-                self.replaying = True
-                threading.Thread(target=self.execute_cron_job_once, args=(cron_job,)).start()
+                # Manual plays wait in the same queue as scheduled runs so they never overlap
+                run = self.cron_runs.submit(cron_job)
+                if run is None:
+                    messagebox.showinfo("Skipped", f"{cron_job['name']} is still running and its overlap policy is 'skip'.")
+                    return
+                self.manual_cron_run = run
+                self.play_cron_button.config(text="Stop", command=self.stop_cron_job_replay)
+                if run.finished_at is not None:
+                    # Finished before it was known to be the manual run, on_cron_run_finish missed it
+                    self.manual_cron_run = None
+                    self.reset_play_button()
             else:
                 messagebox.showinfo("Execution Disabled", "Cron job execution is currently disabled. Enable it using the checkbox.")
 
     def duplicate_cron_job(self):
-        selected = self.cron_jobs_tree.selection()
-        if selected:
-            item = selected[0]
-            index = int(self.cron_jobs_tree.item(item, 'tags')[0])  # Get the original index from the tag
+        index = self.selected_cron_index()
+        if index is not None:
             cron_job = self.cron_jobs[index].copy()
             cron_job['name'] = f"{cron_job['name']} {index}"
             self.cron_jobs.append(cron_job)
             self.update_cron_jobs_list()
 
-    def execute_cron_job_once(self, cron_job):
-        self.root.after(0, lambda: self.current_cron_job_label.config(text=f"|   Currently Playing: {cron_job['name']}"))
-        self.play_cron_button.config(text="Stop")
-        for action in cron_job['actions']:
-            if not self.replaying:
-                    break
-            action_type, action_detail, delay = action
-            time.sleep(delay)
-            if action_type == 'click':
-                x, y = action_detail
-                pyautogui.click(x, y)
-            elif action_type == 'key':
-                # Check if action detail is a single key or not a special key
-                if str(action_detail).lower() in [str(key).lower() for key in self.special_keys]:
-                    pyautogui.press(action_detail)
-                else:
-                    pyautogui.write(action_detail)
-        
-        self.root.after(0, self.reset_play_button)
-        self.root.after(0, lambda: self.current_cron_job_label.config(text="|   Currently Playing: None"))
+    def on_cron_run_start(self, run):
+        # Called on a cron worker thread
+        run.job['last_executed'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.root.after(0, self.refresh_cron_job, run.job)  # Update the UI to reflect the last executed time
+        self.root.after(0, self.show_playing_cron_job, run.job['name'])
+
+    def on_cron_run_finish(self, run):
+        # Called on a cron worker thread
+        if run is self.manual_cron_run:
+            self.manual_cron_run = None
+            self.root.after(0, self.reset_play_button)
+        if not self.cron_runs.active():
+            self.root.after(0, self.show_playing_cron_job, "None")
+        self.root.after(0, self.update_metrics_summary)
+
+    def show_playing_cron_job(self, name):
+        if self.tab_built(self.cron_frame):
+            self.current_cron_job_label.config(text=f"|   Currently Playing: {name}")
 
     def reset_play_button(self):
-        self.play_cron_button.config(text="Play", state=tk.NORMAL)
+        self.play_cron_button.config(text="Play", state=tk.NORMAL, command=self.play_cron_job)
 
     def stop_cron_job_replay(self):
-        self.replaying = False
+        if self.manual_cron_run:
+            self.manual_cron_run.cancel()
         self.play_cron_button.config(text="Play", command=self.play_cron_job)
 
     def import_cron_jobs(self):
         file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
         if file_path:
-            try:
-                with open(file_path, 'r') as file:
-                    data = json.load(file)
-                    self.cron_jobs = []
-                    for item in data:
-                        cron_job = {
-                            'name': item['name'],
-                            'actions': item['actions'],
-                            'cron_expression': item['cron_expression'],
-                            'time': item.get('time', '12:00 AM'),  # Default time if not present
-                            'active': item.get('active', True),
-                            'last_executed': item.get('last_executed', '-')
-                        }
-                        self.cron_jobs.append(cron_job)
+            # The current jobs stay listed and scheduled until the whole file has been parsed,
+            # a failed import leaves them untouched
+            imported = []
+
+            def done(error):
+                if error is None:
+                    self.cron_jobs = imported
                     self.update_cron_jobs_list()
-                messagebox.showinfo("Import Successful", "Cron jobs imported successfully.")
-            except Exception as e:
-                messagebox.showerror("Import Error", f"Failed to import cron jobs: {str(e)}")
-                logging.error(f"Cron job import error: {str(e)}")
+                    messagebox.showinfo("Import Successful", "Cron jobs imported successfully.")
+                else:
+                    messagebox.showerror("Import Error", f"Failed to import cron jobs: {str(error)}")
+                    logging.error(f"Cron job import error: {str(error)}")
+
+            self.stream_import(iter_cron_jobs(file_path), imported.extend, done)
 
     def save_cron_jobs(self):
         if not self.cron_jobs:
@@ -370,7 +547,7 @@ class ActionRecorder:
         if file_path:
             try:
                 with open(file_path, 'w') as file:
-                    json.dump(self.cron_jobs, file, indent=2)
+                    json.dump([dict(job, actions=list(job['actions'])) for job in self.cron_jobs], file, indent=2)
                 messagebox.showinfo("Save Successful", "Cron jobs saved successfully.")
             except Exception as e:
                 messagebox.showerror("Save Error", f"Failed to save cron jobs: {str(e)}")
@@ -382,117 +559,100 @@ class ActionRecorder:
             self.update_cron_jobs_list()
 
     def edit_cron_job(self):
-        selected = self.cron_jobs_tree.selection()
-        if selected:
-            item = selected[0]
-            original_index = int(self.cron_jobs_tree.item(item, 'tags')[0])  # Get the original index from the tag
+        original_index = self.selected_cron_index()
+        if original_index is not None:
             if 0 <= original_index < len(self.cron_jobs):
                 cron_job = self.cron_jobs[original_index]
                 dialog = EditCronJobDialog(self.root, cron_job)
                 if dialog.result:
-                    self.cron_jobs[original_index] = dialog.result
+                    # Updated in place, so the scheduler and any queued run still see the same job
+                    cron_job.update(dialog.result)
                     self.update_cron_jobs_list()
             else:
                 messagebox.showerror("Error", "Invalid cron job index.")
 
     def delete_cron_job(self):
-        selected = self.cron_jobs_tree.selection()
-        if selected:
-            item = selected[0]
-            original_index = int(self.cron_jobs_tree.item(item, 'tags')[0])  # Get the original index from the tag
+        original_index = self.selected_cron_index()
+        if original_index is not None:
             del self.cron_jobs[original_index]
             self.update_cron_jobs_list()
 
     def toggle_cron_job_active(self):
-        selected = self.cron_jobs_tree.selection()
-        if selected:
-            item = selected[0]
-            original_index = int(self.cron_jobs_tree.item(item, 'tags')[0])  # Get the original index from the tag
+        original_index = self.selected_cron_index()
+        if original_index is not None:
             self.cron_jobs[original_index]['active'] = not self.cron_jobs[original_index]['active']
-            self.update_cron_jobs_list()
+            self.cron_scheduler.reschedule(self.cron_jobs)
+            self.cron_jobs_tree.update_row(self.cron_jobs_tree.selected_index())
 
     def add_to_cron_job(self):
         if self.current_list:
-            time_str = simpledialog.askstring("Set Time", "Enter time (HH:MM AM/PM):", parent=self.root)
+            time_str = simpledialog.askstring("Set Time", "Enter time (HH:MM AM/PM) or cron expression:", parent=self.root)
             if time_str:
                 try:
-                    # Convert 12-hour format to 24-hour format
-                    time_obj = datetime.strptime(time_str, "%I:%M %p")
-                    cron_expression = f"{time_obj.minute} {time_obj.hour} * * *"
+                    # Daily times are converted to a cron expression, full cron syntax is kept as is
+                    cron_expression = parse_schedule(time_str)
                     cron_job = {
                         'name': self.current_list.name,
-                        'actions': self.current_list.actions,
+                        'actions': ActionColumns(self.current_list.actions),
                         'cron_expression': cron_expression,
                         'time': time_str,  # Store the original time string
                         'active': True,
-                        'last_executed': '-'
+                        'last_executed': '-',
+                        'overlap': 'queue',
+                        'speed': self.current_list.speed,
+                        'max_gap': self.current_list.max_gap
                     }
                     self.cron_jobs.append(cron_job)
                     self.update_cron_jobs_list()
                     messagebox.showinfo("Cron Job Added", f"Added cron job to run at: {time_str}")
                 except ValueError:
-                    messagebox.showerror("Invalid Input", "Please enter time in HH:MM AM/PM format")
+                    messagebox.showerror("Invalid Input", "Please enter time in HH:MM AM/PM format or a cron expression (e.g. */15 9-17 * * mon-fri)")
 
     def update_cron_jobs_list(self):
-        self.cron_jobs_tree.delete(*self.cron_jobs_tree.get_children())
-        
         # Sort cron jobs by time
-        sorted_jobs = sorted(enumerate(self.cron_jobs), key=lambda x: datetime.strptime(x[1]['time'], "%I:%M %p"))
-        
-        for i, (original_index, job) in enumerate(sorted_jobs):
-            self.cron_jobs_tree.insert("", tk.END, values=(
-                i+1, 
-                job['name'], 
-                len(job['actions']), 
-                job['time'],
-                "✓" if job['active'] else "✗",
-                job.get('last_executed', '-')
-            ), tags=(original_index,))  # Store the original index as a tag
-
-    def check_and_execute_cron_jobs(self):
-        current_time = datetime.now()
-        for cron_job in self.cron_jobs:
-            if cron_job['active']:
-                job_time = datetime.strptime(cron_job['time'], "%I:%M %p").time()
-                if current_time.time().hour == job_time.hour and current_time.time().minute == job_time.minute and current_time.time().second == 0:
-                    # Execute cron job actions
-                    action_list = ActionList(cron_job['name'])
-                    action_list.actions = cron_job['actions']
-                    self.replaying = True
-                    threading.Thread(target=self.execute_action_list, args=(action_list,)).start()
-                    cron_job['last_executed'] = current_time.strftime("%Y-%m-%d %H:%M:%S")
-                    self.update_cron_jobs_list()  # Update the UI to reflect the last executed time
-
-        # Schedule the next check in 1 second
-        self.root.after(1000, self.check_and_execute_cron_jobs)
-
-        # Update the current time display
-        current_time_str = current_time.strftime("%I:%M:%S %p")
-        self.current_time_label.config(text=f"Current Time: {current_time_str}")
-
-        # Update the current time display
-        def update_time_display():
-            current_time_str = current_time.strftime("%I:%M:%S %p")
-            self.current_time_label.config(text=f"Current Time: {current_time_str}")
-        
-        self.root.after(0, update_time_display)
-        
-    def execute_action_list(self, action_list):
-        for action in action_list.actions:
-            if not self.replaying:
-                    break
-            action_type, action_detail, delay = action
-            time.sleep(delay)
-            if action_type == 'click':
-                x, y = action_detail
-                pyautogui.click(x, y)
-            elif action_type == 'key':
-                    print(action_detail)
-                    if str(action_detail).lower() in [str(key).lower() for key in self.special_keys]:
-                        pyautogui.press(action_detail)
-                    else:
-                        pyautogui.write(action_detail)
+        self.cron_order = sorted(range(len(self.cron_jobs)), key=lambda i: day_order_key(self.cron_jobs[i]['cron_expression']))
+        self.cron_scheduler.reschedule(self.cron_jobs)
+        self.refresh_cron_tree()
+
+    def refresh_cron_tree(self):
+        if not self.tab_built(self.cron_frame):
+            return
+        self.cron_jobs_tree.clear_selection()
+        self.cron_jobs_tree.set_row_count(len(self.cron_order))
+        self.on_cron_job_select(None)
+
+    def cron_job_row(self, row):
+        job = self.cron_jobs[self.cron_order[row]]
+        last_executed = job.get('last_executed', '-')
+        latency = self.cron_scheduler.job_latency(job)
+        if latency and last_executed != '-':
+            last_executed = f"{last_executed} (+{latency[0] * 1000:.0f} ms)"
+        return (
+            row + 1,
+            job['name'],
+            len(job['actions']),
+            job['time'],
+            "✓" if job['active'] else "✗",
+            last_executed
+        ), ()
+
+    def refresh_cron_job(self, cron_job):
+        if not self.tab_built(self.cron_frame):
+            return
+        for row, original_index in enumerate(self.cron_order):
+            if self.cron_jobs[original_index] is cron_job:
+                self.cron_jobs_tree.update_row(row)
+                break
 
+    def on_cron_fire(self, cron_job, scheduled):
+        # Runs on the cron timer thread: queue the job straight away, the run manager notifies the UI
+        self.cron_runs.submit(cron_job, scheduled)
+
+    def update_current_time(self):
+        # Update the current time display on the next clock second
+        self.current_time_label.config(text=f"Current Time: {datetime.now().strftime('%I:%M:%S %p')}")
+        self.root.after(int((1 - time.time() % 1) * 1000) + 1, self.update_current_time)
+        
     def create_settings_widgets(self):
         ttk.Label(self.settings_frame, text="Theme:").grid(row=0, column=0, padx=10, pady=10, sticky="w")
         ttk.Checkbutton(self.settings_frame, text="Dark Mode", variable=self.dark_mode, command=self.toggle_theme).grid(row=0, column=1, padx=10, pady=10, sticky="w")
@@ -501,6 +661,68 @@ class ActionRecorder:
         ttk.Label(self.settings_frame, text="Last updated: 12/07/2024").grid(row=2, column=0, padx=10, pady=10, sticky="w")
         ttk.Label(self.settings_frame, text="Credit: Concept By Nick Lim | Assisted by Sonet 3.5").grid(row=3, column=0, padx=10, pady=10, sticky="w")
 
+        ttk.Label(self.settings_frame, text="Playback:").grid(row=4, column=0, padx=10, pady=10, sticky="w")
+        ttk.Checkbutton(self.settings_frame, text=f"Batch typing and repeated clicks (< {COALESCE_THRESHOLD * 1000:.0f} ms apart)", variable=self.coalesce_var, command=self.toggle_coalesce).grid(row=4, column=1, padx=10, pady=10, sticky="w")
+
+        ttk.Label(self.settings_frame, text="Parallel cron jobs:").grid(row=5, column=0, padx=10, pady=10, sticky="w")
+        ttk.Spinbox(self.settings_frame, from_=1, to=8, width=5, textvariable=self.cron_workers_var, command=self.update_cron_workers).grid(row=5, column=1, padx=10, pady=10, sticky="w")
+
+        ttk.Label(self.settings_frame, text="Recording:").grid(row=6, column=0, padx=10, pady=10, sticky="w")
+        ttk.Checkbutton(self.settings_frame, text="Journal recordings to disk (crash-safe)", variable=self.journal_var).grid(row=6, column=1, padx=10, pady=10, sticky="w")
+        ttk.Checkbutton(self.settings_frame, text="Record mouse moves, drags and scrolls (simplified paths)", variable=self.motion_var).grid(row=7, column=1, padx=10, pady=10, sticky="w")
+        ttk.Checkbutton(self.settings_frame, text="Fold repeated action blocks into loops when a recording stops", variable=self.compress_var).grid(row=8, column=1, padx=10, pady=10, sticky="w")
+
+        ttk.Label(self.settings_frame, text="Metrics:").grid(row=9, column=0, padx=10, pady=10, sticky="w")
+        ttk.Checkbutton(self.settings_frame, text="Time every played action (lateness, input call, pauses)", variable=self.metrics_var, command=self.toggle_metrics).grid(row=9, column=1, padx=10, pady=10, sticky="w")
+
+        columns = ("List", "Runs", "Actions", "Late p99", "Late max", "In calls", "Paused")
+        self.metrics_tree = ttk.Treeview(self.settings_frame, columns=columns, show='headings', height=6)
+        for column in columns:
+            self.metrics_tree.heading(column, text=column)
+            self.metrics_tree.column(column, width=160 if column == "List" else 80, anchor="w" if column == "List" else "e")
+        self.metrics_tree.grid(row=10, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+
+        metrics_button_frame = ttk.Frame(self.settings_frame)
+        metrics_button_frame.grid(row=11, column=0, columnspan=2, padx=10, pady=5, sticky="w")
+        ttk.Button(metrics_button_frame, text="Refresh", command=self.update_metrics_summary).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(metrics_button_frame, text="Export", command=self.export_metrics).pack(side=tk.LEFT, padx=5)
+        ttk.Button(metrics_button_frame, text="Reset", command=self.reset_metrics).pack(side=tk.LEFT, padx=5)
+
+    def toggle_metrics(self):
+        self.engine.metrics = self.metrics if self.metrics_var.get() else None
+        self.cron_runs.metrics = self.engine.metrics
+
+    def update_metrics_summary(self):
+        if not self.tab_built(self.settings_frame):
+            return
+        self.metrics_tree.delete(*self.metrics_tree.get_children())
+        for name, runs, actions, p99, maximum, call_seconds, paused in self.metrics.summary():
+            self.metrics_tree.insert("", tk.END, values=(
+                name, runs, actions, f"{p99 * 1000:.1f} ms", f"{maximum * 1000:.1f} ms",
+                format_duration(call_seconds), format_duration(paused),
+            ))
+
+    def export_metrics(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".prom", filetypes=[("Prometheus text", "*.prom"), ("JSON files", "*.json")])
+        if file_path:
+            try:
+                write_metrics(file_path, self.metrics)
+                messagebox.showinfo("Export Successful", "Metrics exported successfully.")
+            except Exception as e:
+                messagebox.showerror("Export Error", f"Failed to export metrics: {str(e)}")
+                logging.error(f"Metrics export error: {str(e)}")
+
+    def reset_metrics(self):
+        self.metrics.reset()
+        self.update_metrics_summary()
+
+    def toggle_coalesce(self):
+        self.engine.coalesce = COALESCE_THRESHOLD if self.coalesce_var.get() else None
+        self.cron_runs.coalesce = self.engine.coalesce
+
+    def update_cron_workers(self):
+        self.cron_runs.set_max_workers(self.cron_workers_var.get())
+
     def toggle_theme(self):
         if self.dark_mode.get():
             self.style.theme_use('clam')
@@ -596,6 +818,9 @@ class ActionRecorder:
         self.play_button = ttk.Button(button_frame, text="Play", command=self.play_recording, state=tk.DISABLED, style='ButtonFrame.TButton')
         self.play_button.grid(row=10, column=0, pady=5, padx=5, sticky="ew")
 
+        # Buttons above start disabled until there is something recorded
+        self.record_buttons_state = tk.DISABLED
+
         # Add this near the end of the method
         self.check_coords_var = tk.BooleanVar()
         self.check_coords_button = ttk.Checkbutton(
@@ -622,6 +847,7 @@ class ActionRecorder:
     def toggle_coord_check(self):
         if self.check_coords_var.get():
             # self.root.withdraw()  # Hide the main window
+            load_pynput()
             self.coord_listener = mouse.Listener(on_click=self.on_coord_check)
             self.coord_listener.start()
         else:
@@ -651,7 +877,7 @@ class ActionRecorder:
             self.edit_action_button.config(state=tk.DISABLED)
 
     def reset_cycles(self):
-        self.action_repeat_count = 0
+        self.engine.repeat_count = 0
         self.cycle_count_label.config(text="Cycles: 0")
 
     def create_replay_widgets(self):
@@ -672,7 +898,7 @@ class ActionRecorder:
         self.clear_replay_button.pack(side=tk.LEFT, padx=5)
 
         # Row 1 (Replay Tree and Button Frame)
-        self.replay_tree = ttk.Treeview(self.replay_frame, columns=("Sequence", "Name", "Actions", "Repeat", "Interval", "Executed", "Active", "Last Executed"), show='headings')
+        self.replay_tree = VirtualTreeview(self.replay_frame, columns=("Sequence", "Name", "Actions", "Repeat", "Interval", "Executed", "Active", "Last Executed"), row_source=self.replay_row, on_select=self.on_replay_select)
         self.replay_tree.heading("Sequence", text="No.")
         self.replay_tree.heading("Name", text="Name")
         self.replay_tree.heading("Actions", text="Actions")
@@ -683,8 +909,9 @@ class ActionRecorder:
         self.replay_tree.heading("Last Executed", text="Last Executed")
         self.replay_tree.column("Last Executed", width=150, minwidth=150, anchor='center')
         self.replay_tree.grid(row=1, column=0, padx=(10, 0), pady=10, sticky="nsew")
-        self.replay_tree.bind('<ButtonRelease-1>', self.on_replay_tree_click)
-        self.replay_tree.bind('<Double-1>', self.on_replay_tree_double_click)
+        self.replay_tree.tree.bind('<Double-1>', self.on_replay_tree_double_click)
+        self.replay_tree.tag_configure('active', background='lightgreen')
+        self.replay_tree.tag_configure('inactive', background='lightgray')
 
         # Set column widths
         self.replay_tree.column("Sequence", width=30, minwidth=30, anchor='center')
@@ -745,18 +972,27 @@ class ActionRecorder:
         self.full_cycle_label = ttk.Label(button_frame, text="Full Cycles: 0")
         self.full_cycle_label.grid(row=12, column=0, columnspan=2, pady=5, padx=5, sticky="w")
 
-        self.repeat_all_var = tk.BooleanVar()
+        self.duration_label = ttk.Label(button_frame, text="Est. - / Actual -")
+        self.duration_label.grid(row=13, column=0, columnspan=2, pady=5, padx=5, sticky="w")
+
         self.repeat_all_checkbox = ttk.Checkbutton(button_frame, text="Repeat All", variable=self.repeat_all_var)
-        self.repeat_all_checkbox.grid(row=13, column=0, columnspan=2, pady=5, padx=5, sticky="w")
+        self.repeat_all_checkbox.grid(row=14, column=0, columnspan=2, pady=5, padx=5, sticky="w")
+
+        # Run level speed and gap cap, combined with each list's own settings
+        ttk.Label(button_frame, text="Speed:").grid(row=15, column=0, pady=5, padx=5, sticky="w")
+        ttk.Entry(button_frame, textvariable=self.speed_var, width=8).grid(row=15, column=1, pady=5, padx=5, sticky="ew")
+
+        ttk.Label(button_frame, text="Max gap (s):").grid(row=16, column=0, pady=5, padx=5, sticky="w")
+        ttk.Entry(button_frame, textvariable=self.max_gap_var, width=8).grid(row=16, column=1, pady=5, padx=5, sticky="ew")
 
         self.start_button = ttk.Button(button_frame, text="Start", command=self.start_replay, style='ButtonFrame.TButton')
-        self.start_button.grid(row=14, column=0, columnspan=2, pady=5, padx=5, sticky="ew")
+        self.start_button.grid(row=17, column=0, columnspan=2, pady=5, padx=5, sticky="ew")
 
         self.pause_button = ttk.Button(button_frame, text="Pause", command=self.pause_replay, state=tk.DISABLED, style='ButtonFrame.TButton')
-        self.pause_button.grid(row=15, column=0, pady=5, padx=5, sticky="ew")
+        self.pause_button.grid(row=18, column=0, pady=5, padx=5, sticky="ew")
 
         self.stop_button = ttk.Button(button_frame, text="Stop", command=self.stop_replay, state=tk.DISABLED, style='ButtonFrame.TButton')
-        self.stop_button.grid(row=15, column=1, pady=5, padx=5, sticky="ew")
+        self.stop_button.grid(row=18, column=1, pady=5, padx=5, sticky="ew")
 
         # Configure grid weights
         self.replay_frame.grid_columnconfigure(0, weight=1)
@@ -764,31 +1000,27 @@ class ActionRecorder:
         self.replay_frame.grid_rowconfigure(1, weight=1)
 
         # Add a horizontal scrollbar
-        h_scroll = ttk.Scrollbar(self.replay_frame, orient="horizontal", command=self.replay_tree.xview)
+        h_scroll = ttk.Scrollbar(self.replay_frame, orient="horizontal", command=self.replay_tree.tree.xview)
         h_scroll.grid(row=2, column=0, columnspan=2, sticky="ew")
-        self.replay_tree.configure(xscrollcommand=h_scroll.set)
+        self.replay_tree.tree.configure(xscrollcommand=h_scroll.set)
 
     def combine_new_import(self):
         file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
         if file_path:
-            try:
-                with open(file_path, 'r') as file:
-                    new_data = json.load(file)
-                    for item in new_data:
-                        action_list = ActionList(item['name'], item['sequence'], item.get('interval', 0))
-                        action_list.actions = item['actions']
-                        action_list.repeat = item['repeat']
-                        action_list.active = item.get('active', True)
-                        action_list.last_executed = "-"
-                        self.action_lists.append(action_list)
-                    self.update_replay_list()
-                messagebox.showinfo("Import Successful", "Replay actions combined successfully.")
-            except Exception as e:
-                messagebox.showerror("Import Error", f"Failed to import and combine replay actions: {str(e)}")
-                logging.error(f"Import and combine error: {str(e)}")
+            def add_lists(action_lists):
+                for action_list in action_lists:
+                    action_list.last_executed = "-"
+                self.action_lists.extend(action_lists)
+                self.update_replay_list()
+
+            def done(error):
+                if error is None:
+                    messagebox.showinfo("Import Successful", "Replay actions combined successfully.")
+                else:
+                    messagebox.showerror("Import Error", f"Failed to import and combine replay actions: {str(error)}")
+                    logging.error(f"Import and combine error: {str(error)}")
 
-    def on_replay_tree_click(self, event):
-        self.on_replay_select(event)
+            self.stream_import(iter_action_lists(file_path), add_lists, done)
 
     def on_replay_tree_double_click(self, event):
         region = self.replay_tree.identify("region", event.x, event.y)
@@ -800,8 +1032,7 @@ class ActionRecorder:
                 self.edit_replay_in_tree(event)
 
     def on_replay_select(self, event):
-        selected = self.replay_tree.selection()
-        if selected:
+        if self.replay_tree.selected_index() is not None:
             self.delete_replay_button.config(state=tk.NORMAL)
             self.edit_replay_button.config(state=tk.NORMAL)
             self.add_to_record_button.config(state=tk.NORMAL)
@@ -816,16 +1047,17 @@ class ActionRecorder:
         self.update_move_buttons()
 
     def duplicate_replay_item(self):
-        selected = self.replay_tree.selection()
-        if selected:
-            index = self.replay_tree.index(selected[0])
+        index = self.replay_tree.selected_index()
+        if index is not None:
             original_item = self.action_lists[index]
             new_item = ActionList(f"{original_item.name} (Copy)", original_item.sequence, original_item.interval, original_item.active)
             new_item.actions = original_item.actions.copy()
             new_item.repeat = original_item.repeat
+            new_item.speed = original_item.speed
+            new_item.max_gap = original_item.max_gap
             self.action_lists.insert(index + 1, new_item)
             self.update_replay_list()
-            self.replay_tree.selection_set(self.replay_tree.get_children()[index + 1])
+            self.replay_tree.select_index(index + 1)
 
     def clear_replay(self):
         if messagebox.askyesno("Clear Replay", "Are you sure you want to clear all replay actions?"):
@@ -833,9 +1065,8 @@ class ActionRecorder:
             self.update_replay_list()
 
     def add_to_record(self):
-        selected = self.replay_tree.selection()
-        if selected:
-            index = self.replay_tree.index(selected[0])
+        index = self.replay_tree.selected_index()
+        if index is not None:
             action_list = self.action_lists[index]
             self.current_list = ActionList(action_list.name)
             self.current_list.actions = action_list.actions.copy()
@@ -843,9 +1074,10 @@ class ActionRecorder:
             self.notebook.select(0)  # Switch to the Record tab
 
     def update_move_buttons(self):
-        selected = self.replay_tree.selection()
-        if selected:
-            index = self.replay_tree.index(selected[0])
+        if not self.tab_built(self.replay_frame):
+            return
+        index = self.replay_tree.selected_index()
+        if index is not None:
             self.move_up_button.config(state=tk.NORMAL if index > 0 else tk.DISABLED)
             self.move_down_button.config(state=tk.NORMAL if index < len(self.action_lists) - 1 else tk.DISABLED)
         else:
@@ -853,24 +1085,22 @@ class ActionRecorder:
             self.move_down_button.config(state=tk.DISABLED)
 
     def move_up(self):
-        selected = self.replay_tree.selection()
-        if selected:
-            index = self.replay_tree.index(selected[0])
+        index = self.replay_tree.selected_index()
+        if index is not None:
             if index > 0:
                 self.action_lists[index], self.action_lists[index-1] = self.action_lists[index-1], self.action_lists[index]
                 self.action_lists[index].sequence, self.action_lists[index-1].sequence = self.action_lists[index-1].sequence, self.action_lists[index].sequence
                 self.update_replay_list()
-                self.replay_tree.selection_set(self.replay_tree.get_children()[index-1])
+                self.replay_tree.select_index(index - 1)
 
     def move_down(self):
-        selected = self.replay_tree.selection()
-        if selected:
-            index = self.replay_tree.index(selected[0])
+        index = self.replay_tree.selected_index()
+        if index is not None:
             if index < len(self.action_lists) - 1:
                 self.action_lists[index], self.action_lists[index+1] = self.action_lists[index+1], self.action_lists[index]
                 self.action_lists[index].sequence, self.action_lists[index+1].sequence = self.action_lists[index+1].sequence, self.action_lists[index].sequence
                 self.update_replay_list()
-                self.replay_tree.selection_set(self.replay_tree.get_children()[index+1])
+                self.replay_tree.select_index(index + 1)
 
 
     def add_edit_buttons(self):
@@ -880,37 +1110,137 @@ class ActionRecorder:
         self.edit_replay_button = ttk.Button(self.replay_frame, text="Edit Replay", command=self.edit_selected_replay, style='Big.TButton', width=10)
         self.edit_replay_button.grid(row=1, column=4, padx=10, pady=10, sticky="nsew")
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def start_recording(self):
         if not self.recording:
             self.recording = True
             self.current_list = ActionList(f"Recording_{len(self.action_lists) + 1}")
-            self.last_time = time.time()
+            self.events.clear()
+            self.clock = DelayClock()
+            self.motion = MotionSimplifier() if self.motion_var.get() else None
+            if self.journal_var.get():
+                try:
+                    self.journal = RecordingJournal(self.current_list.name)
+                except OSError as e:
+                    messagebox.showerror("Journal Error", f"Failed to open recording journal: {str(e)}")
+                    logging.error(f"Journal error: {str(e)}")
+            self.update_action_list()
+            self.drain_job = self.root.after(DRAIN_INTERVAL, self.drain_events)
             self.record_button.config(text="Stop Recording")
-            self.status_label.config(text="Status: Recording")
+            self.set_replay_status("Status: Recording")
         else:
             self.stop_recording()
 
     def stop_recording(self):
         self.recording = False
         self.record_button.config(text="Record")
-        self.status_label.config(text="Status: Stopped")
+        self.set_replay_status("Status: Stopped")
+        # Events still in the ring belong to this recording, drain them before it is finished
+        if self.drain_job:
+            self.root.after_cancel(self.drain_job)
+        self.drain_job = self.root.after(0, self.drain_events)
+        if self.journal:
+            # Queued after any events still waiting on the Tk loop, so they land in the journal too
+            self.root.after(0, self.finish_journal, self.current_list, self.journal)
+        if self.compress_var.get():
+            self.root.after(0, self.compress_recording, self.current_list)
         self.root.after(0, self.update_action_list)
         self.action_lists.append(self.current_list)
         self.root.after(0, self.update_replay_list)
 
+    def compress_recording(self, action_list):
+        before = len(action_list.actions)
+        action_list.actions = compress_actions(action_list.actions)
+        logging.info(f"Recording {action_list.name} compressed from {before} to {len(action_list.actions)} actions")
+
+    def finish_journal(self, action_list, journal):
+        self.journal = None
+        journal.close()
+        try:
+            action_list.actions = journal.compact().actions
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Journal Error", f"Failed to load journaled recording: {str(e)}")
+            logging.error(f"Journal error: {str(e)}")
+        self.journals[action_list] = journal.path
+
+    def forget_journal(self, action_list):
+        # The recording is safely saved elsewhere now
+        path = self.journals.pop(action_list, None)
+        if path:
+            # The list may still be reading the compacted .aar through its mapping
+            if isinstance(action_list.actions, BinaryActions):
+                action_list.actions.materialize()
+            discard_journal(path)
+
+    def recover_recordings(self):
+        remove_orphans()
+        paths = pending_journals()
+        if not paths:
+            return
+        if messagebox.askyesno("Recover Recordings", f"Found {len(paths)} unsaved recording(s) from a previous session. Add them to the replay list?"):
+            for path in paths:
+                try:
+                    action_list = compact_journal(path)
+                except (OSError, ValueError) as e:
+                    logging.error(f"Journal recovery error for {path}: {str(e)}")
+                    continue
+                action_list.sequence = len(self.action_lists)
+                self.action_lists.append(action_list)
+                self.journals[action_list] = path
+            self.update_replay_list()
+        else:
+            for path in paths:
+                discard_journal(path)
+
+    def drain_events(self):
+        # One pass over everything captured since the last drain, with a single UI update
+        batch = self.events.drain()
+        if self.motion:
+            events = []
+            for event in batch:
+                events += self.motion.feed(*event)
+            events += self.motion.flush_idle(time.perf_counter_ns()) if self.recording else self.motion.finish()
+            batch = events
+        if batch:
+            actions = []
+            for timestamp, kind, detail in batch:
+                delay = self.clock.delay(timestamp)
+                if kind == 'key':
+                    detail = self.key_to_string(detail)
+                actions.append((kind, detail, delay))
+            self.record_actions(actions)
+        dropped = self.events.take_dropped()
+        if dropped:
+            logging.warning(f"Recording dropped {dropped} events, the input ring was full")
+        self.drain_job = self.root.after(DRAIN_INTERVAL, self.drain_events) if self.recording else None
+
+    def record_actions(self, actions):
+        if self.journal:
+            for action in actions:
+                self.journal.append(action)
+        else:
+            self.current_list.actions.extend(actions)
+        self.append_action_rows(actions)
+
     def on_click(self, x, y, button, pressed):
-        if self.recording and pressed and not self.check_coords_var.get():
-            self.root.after(0, self.add_click_action, x, y)
-
-    def add_click_action(self, x, y):
-        current_time = time.time()
-        delay = current_time - self.last_time
-        self.last_time = current_time
-        self.current_list.add_action(('click', (x, y), delay))
-        self.root.after(0, self.update_action_list)
+        # Runs on the pynput thread, the timestamp is taken here rather than when the UI gets to it
+        if self.recording and not self.check_coords_var.get():
+            if self.motion and button == mouse.Button.left:
+                # Press and release go to the motion simplifier, which tells clicks from drags
+                self.events.push('press' if pressed else 'release', (x, y))
+            elif pressed:
+                self.events.push('click', (x, y))
+
+    def on_move(self, x, y):
+        if self.recording and self.motion:
+            self.events.push('move', (x, y))
+
+    def on_scroll(self, x, y, dx, dy):
+        if self.recording and self.motion and not self.check_coords_var.get():
+            self.events.push('scroll', (dx, dy))
 
     def on_press(self, key):
+        timestamp = time.perf_counter_ns()
         try:
             if key == keyboard.Key.esc:
                 if self.recording:
@@ -919,6 +1249,8 @@ class ActionRecorder:
                     self.stop_replay()
                 elif hasattr(self, 'play_cron_button') and self.play_cron_button['text'] == "Stop":
                     self.stop_cron_job_replay()
+                elif self.cron_runs.active():
+                    self.cron_runs.cancel_all()
             elif key == keyboard.Key.home:
                 self.start_replay()
             elif key == keyboard.Key.end:
@@ -927,15 +1259,7 @@ class ActionRecorder:
             pass
 
         if self.recording:
-            self.root.after(0, self.add_key_action, key)
-
-    def add_key_action(self, key):
-        current_time = time.time()
-        delay = current_time - self.last_time
-        self.last_time = current_time
-        key_str = self.key_to_string(key)
-        self.current_list.add_action(('key', key_str, delay))
-        self.root.after(0, self.update_action_list)
+            self.events.push('key', key, timestamp)
 
     def key_to_string(self, key):
         # Convert key to string for PyAutoGUI
@@ -964,48 +1288,48 @@ class ActionRecorder:
             }
             return special_keys.get(key, str(key).replace('Key.', ''))
 
+    def action_to_string(self, action_type, action_detail):
+        return action_to_string(action_type, action_detail)
+
+    def append_action_rows(self, actions):
+        # Recording only ever appends, so add the new rows instead of rebuilding the tree
+        if self.journal:
+            actions = actions[-RECORD_TREE_WINDOW:]
+        for action_type, action_detail, delay in actions:
+            self.action_tree.insert("", tk.END, values=(self.action_to_string(action_type, action_detail), f"{delay:.2f}"))
+        if self.journal:
+            rows = self.action_tree.get_children()
+            if len(rows) > RECORD_TREE_WINDOW:
+                self.action_tree.delete(*rows[:len(rows) - RECORD_TREE_WINDOW])
+        self.update_record_buttons()
+
     def update_action_list(self):
         self.action_tree.delete(*self.action_tree.get_children())
-        for action in self.current_list.actions:
-            action_type, action_detail, delay = action
-            if action_type == 'click':
-                action_str = f"Click at {action_detail}"
-            elif action_type == 'key':
-                action_str = f"Key {action_detail}"
-            self.action_tree.insert("", tk.END, values=(action_str, f"{delay:.2f}"))
-
-        if self.current_list.actions:
-            self.export_button.config(state=tk.NORMAL)
-            self.delete_button.config(state=tk.NORMAL)
-            self.clear_button.config(state=tk.NORMAL)
-            self.add_to_replay_button.config(state=tk.NORMAL)
-            self.add_to_cron_job_button.config(state=tk.NORMAL)
-            self.play_button.config(state=tk.NORMAL)
-        else:
-            self.export_button.config(state=tk.DISABLED)
-            self.delete_button.config(state=tk.DISABLED)
-            self.clear_button.config(state=tk.DISABLED)
-            self.add_to_replay_button.config(state=tk.DISABLED)
-            self.add_to_cron_job_button.config(state=tk.DISABLED)
-            self.play_button.config(state=tk.DISABLED)
+        if self.current_list:
+            for action in self.current_list.actions:
+                action_type, action_detail, delay = action
+                self.action_tree.insert("", tk.END, values=(self.action_to_string(action_type, action_detail), f"{delay:.2f}"))
+        self.update_record_buttons()
+
+    def update_record_buttons(self):
+        state = tk.NORMAL if self.current_list and self.current_list.actions else tk.DISABLED
+        if state == self.record_buttons_state:
+            return
+        self.record_buttons_state = state
+        self.export_button.config(state=state)
+        self.delete_button.config(state=state)
+        self.clear_button.config(state=state)
+        self.add_to_replay_button.config(state=state)
+        self.add_to_cron_job_button.config(state=state)
+        self.play_button.config(state=state)
 
     def update_replay_list(self):
-        self.replay_tree.delete(*self.replay_tree.get_children())
         for i, action_list in enumerate(self.action_lists):
             action_list.sequence = i  # Update sequence
-            item = self.replay_tree.insert("", tk.END, values=(
-                action_list.sequence, 
-                action_list.name, 
-                len(action_list.actions), 
-                action_list.repeat, 
-                action_list.interval,
-                getattr(action_list, 'executed', 0),
-                "✓" if action_list.active else "✗"
-            ))
-            self.replay_tree.item(item, tags=('active' if action_list.active else 'inactive',))
-        
-        self.replay_tree.tag_configure('active', background='lightgreen')
-        self.replay_tree.tag_configure('inactive', background='lightgray')
+        if not self.tab_built(self.replay_frame):
+            return
+        self.replay_tree.clear_selection()
+        self.replay_tree.set_row_count(len(self.action_lists))
         
         # Reset button states
         self.delete_replay_button.config(state=tk.DISABLED)
@@ -1015,14 +1339,39 @@ class ActionRecorder:
         
         self.update_move_buttons()
 
+    def replay_row(self, index):
+        action_list = self.action_lists[index]
+        last_executed = action_list.last_executed
+        if isinstance(last_executed, (int, float)) and last_executed > 0:
+            last_executed = datetime.fromtimestamp(last_executed).strftime("%Y-%m-%d %H:%M:%S")
+        elif not last_executed:
+            last_executed = "-"
+        return (
+            action_list.sequence, 
+            action_list.name, 
+            len(action_list.actions), 
+            action_list.repeat, 
+            action_list.interval,
+            getattr(action_list, 'executed', 0),
+            "✓" if action_list.active else "✗",
+            last_executed
+        ), ('active' if action_list.active else 'inactive',)
+
+    def refresh_replay_item(self, action_list):
+        # Only the executed / last executed cells of one entry change after it has played
+        if not self.tab_built(self.replay_frame):
+            return
+        for index, item in enumerate(self.action_lists):
+            if item is action_list:
+                self.replay_tree.update_row(index)
+                break
+
     def toggle_active(self):
-        selected = self.replay_tree.selection()
-        if selected:
-            item = selected[0]
-            index = self.replay_tree.index(item)
+        index = self.replay_tree.selected_index()
+        if index is not None:
             action_list = self.action_lists[index]
             action_list.active = not action_list.active
-            self.update_replay_list()
+            self.replay_tree.update_row(index)
 
     def edit_action_in_tree(self, event):
         selected = self.action_tree.selection()
@@ -1061,26 +1410,12 @@ class ActionRecorder:
         self.update_action_list()
 
     def parse_action_string(self, action_str):
-        if action_str.startswith("Click at "):
-            try:
-                coords = eval(action_str.replace("Click at ", ""))
-                if isinstance(coords, tuple) and len(coords) == 2:
-                    return 'click', coords
-                else:
-                    raise ValueError
-            except:
-                raise ValueError("Invalid click coordinates")
-        elif action_str.startswith("Key "):
-            return 'key', action_str.replace("Key ", "")
-        else:
-            raise ValueError("Invalid action string format")
+        return parse_action_string(action_str)
 
     def edit_replay_in_tree(self, event):
-        selected = self.replay_tree.selection()
-        if not selected:
+        index = self.replay_tree.selected_index()
+        if index is None:
             return
-        item = selected[0]
-        index = self.replay_tree.index(item)
         action_list = self.action_lists[index]
         
         # Schedule the dialog creation on the main GUI thread
@@ -1092,7 +1427,7 @@ class ActionRecorder:
             action_list.name, action_list.repeat, action_list.sequence, action_list.interval, action_list.active = dialog.result
             self.update_replay_list()
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def delete_action(self):
         selected = self.action_tree.selection()
         if selected:
@@ -1100,12 +1435,12 @@ class ActionRecorder:
             self.current_list.remove_action(index)
             self.update_action_list()
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def clear_actions(self):
         self.current_list.clear_actions()
         self.update_action_list()
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def add_to_replay(self):
         if self.current_list:
             new_sequence = max([al.sequence for al in self.action_lists], default=-1) + 1
@@ -1115,11 +1450,15 @@ class ActionRecorder:
             self.current_list = None
             self.clear_actions()
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def import_actions(self):
-        file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+        file_path = filedialog.askopenfilename(filetypes=RECORDING_FILETYPES)
         if file_path:
             try:
+                if is_binary_path(file_path):
+                    self.current_list = load_binary(file_path)[0]
+                    self.update_action_list()
+                    return
                 with open(file_path, 'r') as file:
                     data = json.load(file)
                     self.current_list = ActionList(data['name'])
@@ -1129,21 +1468,25 @@ class ActionRecorder:
                 messagebox.showerror("Import Error", f"Failed to import actions: {str(e)}")
                 logging.error(f"Import error: {str(e)}")
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def export_actions(self):
         if not self.current_list or not self.current_list.actions:
             messagebox.showwarning("No Actions", "There are no actions to export.")
             return
         
-        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=RECORDING_FILETYPES)
         if file_path:
             try:
-                data = {
-                    'name': self.current_list.name,
-                    'actions': self.current_list.actions
-                }
-                with open(file_path, 'w') as file:
-                    json.dump(data, file, indent=2)
+                if is_binary_path(file_path):
+                    save_binary(file_path, [self.current_list])
+                else:
+                    data = {
+                        'name': self.current_list.name,
+                        'actions': list(self.current_list.actions)
+                    }
+                    with open(file_path, 'w') as file:
+                        json.dump(data, file, indent=2)
+                self.forget_journal(self.current_list)
                 messagebox.showinfo("Export Successful", "Actions exported successfully.")
             except Exception as e:
                 messagebox.showerror("Export Error", f"Failed to export actions: {str(e)}")
@@ -1153,48 +1496,45 @@ class ActionRecorder:
         if not self.current_list or not self.current_list.actions:
             messagebox.showwarning("No Actions", "There are no actions to play.")
             return
+        if not self.apply_run_speed():
+            return
 
         self.replaying = True
         self.paused = False
         self.play_button.config(text="Stop", command=self.stop_recording_playback)
         threading.Thread(target=self.execute_recording_playback).start()
+        self.start_status_sampling()
 
     def stop_recording_playback(self):
         self.replaying = False
+        self.draw_status()
         self.play_button.config(text="Play", command=self.play_recording)
+        self.update_metrics_summary()
 
     def execute_recording_playback(self):
         repeat_count = int(self.repeat_count_var.get()) if self.repeat_var.get() else 1
-        cycles_completed = 0
-        
-        while self.replaying and (repeat_count == 0 or cycles_completed < repeat_count):
-            for action in self.current_list.actions:
-                if not self.replaying:
-                    break
-                action_type, action_detail, delay = action
-                time.sleep(delay)
-                if action_type == 'click':
-                    x, y = action_detail
-                    pyautogui.click(x, y)
-                elif action_type == 'key':
-                    if str(action_detail).lower() in [str(key).lower() for key in self.special_keys]:
-                        pyautogui.press(action_detail)
-                    else:
-                        pyautogui.write(action_detail)
-
-            cycles_completed += 1
+
+        def on_cycle(action_list, cycles_completed):
             if repeat_count > 0:
-                self.root.after(0, lambda: self.cycle_count_label.config(text=f"Cycles: {cycles_completed}/{repeat_count}"))
+                self.playback_status.publish(f"Cycles: {cycles_completed}/{repeat_count}")
             else:
-                self.root.after(0, lambda: self.cycle_count_label.config(text=f"Cycles: {cycles_completed} (Infinite)"))
+                self.playback_status.publish(f"Cycles: {cycles_completed} (Infinite)")
 
-        self.root.after(0, self.stop_recording_playback)
+        try:
+            self.engine.play_action_list(self.current_list, repeat=repeat_count, on_cycle=on_cycle)
+        except Exception as e:
+            logging.error(f"Playback error: {str(e)}")
+        finally:
+            self.root.after(0, self.stop_recording_playback)
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def start_replay(self):
         if not self.action_lists:
             messagebox.showwarning("No Actions", "There are no action lists to replay.")
             return
+        if not self.apply_run_speed():
+            return
+        self.build_tab(self.replay_frame)  # Home works before the Replay tab has been opened
 
         self.replaying = True
         self.paused = False
@@ -1207,87 +1547,122 @@ class ActionRecorder:
         for action_list in self.action_lists:
             action_list.executed = 0
             action_list.last_executed = 0
-        self.update_replay_list()
+        self.replay_tree.refresh()
 
         threading.Thread(target=self.execute_replay).start()
+        self.start_status_sampling()
 
-    def execute_replay(self):
-        full_cycles = 0
-        while self.replaying:
-            for action_list in sorted(self.action_lists, key=lambda x: x.sequence):
-                if not self.replaying:
-                    break
-                
-                if not action_list.active:
-                    continue  # Skip inactive items
-                
-                current_time = time.time()
-                
-                if (action_list.executed == 0 or 
-                    action_list.interval == 0 or 
-                    current_time >= action_list.last_executed + (action_list.interval * 60)):
-                    
-                    self.action_repeat_count = 0
-                    while self.replaying and (self.action_repeat_count < action_list.repeat or action_list.repeat == 0):
-                        for i, action in enumerate(action_list.actions):
-                            if not self.replaying:
-                                break
-                            while self.paused:
-                                time.sleep(0.1)
-                            action_type, action_detail, delay = action
-                            time.sleep(delay)
-                            if action_type == 'click':
-                                x, y = action_detail
-                                pyautogui.click(x, y)
-                            elif action_type == 'key':
-                                # Check if action detail is a single key or not a special key
-                                if str(action_detail).lower() in [str(key).lower() for key in self.special_keys]:
-                                    pyautogui.press(action_detail)
-                                else:
-                                    pyautogui.write(action_detail)
-                            self.root.after(0, self.update_replay_status, action_list.name, i+1, len(action_list.actions))
-                        self.action_repeat_count += 1
-                        self.root.after(0, self.update_cycle_count)
-                    
-                    action_list.last_executed = time.time()
-                    action_list.executed += 1
-                    self.root.after(0, self.update_replay_list)
-                else:
-                    print(f"Skipping {action_list.name} due to interval not met")
-            
-            full_cycles += 1
-            self.root.after(0, self.update_full_cycle_count, full_cycles)
-            
-            if not self.repeat_all_var.get():
-                break
+    def apply_run_speed(self):
+        try:
+            self.engine.speed = parse_speed(self.speed_var.get())
+            self.engine.max_gap = parse_max_gap(self.max_gap_var.get())
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", str(e))
+            return False
+        return True
 
-        self.root.after(0, self.stop_replay)
+    def execute_replay(self):
+        progress = ["", 0, 0, 0, 0]  # See replay_status, only this thread changes it
 
-    def update_full_cycle_count(self, count):
-        self.full_cycle_label.config(text=f"Full Cycles: {count}")
+        def on_action(action_list, current, total):
+            progress[:4] = action_list.name, current, total, self.engine.repeat_count
+            self.replay_status.publish(tuple(progress))
 
-    def update_replay_status(self, name, current, total):
-        self.current_item_label.config(text=f" {name}, {current}/{total} [{self.action_repeat_count}]")
+        def on_cycle(action_list, count):
+            progress[3] = count
+            self.replay_status.publish(tuple(progress))
 
-    def update_cycle_count(self):
-        self.cycle_count_label.config(text=f"Cycles: {self.action_repeat_count}")
+        def on_full_cycle(count):
+            progress[4] = count
+            self.replay_status.publish(tuple(progress))
 
-    @debounce(0.3)
-    def pause_replay(self):
+        try:
+            self.engine.run_replay(
+                self.action_lists,
+                cycles=self.repeat_all_var.get,
+                on_action=on_action,
+                on_cycle=on_cycle,
+                on_list_done=self.on_replay_list_done,
+                on_full_cycle=on_full_cycle,
+            )
+            if self.engine.last_signal_latency is not None:
+                logging.info(f"Playback reacted to the last pause/resume/stop after {self.engine.last_signal_latency * 1000:.2f} ms")
+        except Exception as e:
+            logging.error(f"Replay error: {str(e)}")
+        finally:
+            self.root.after(0, self.stop_replay)
+
+    def on_replay_list_done(self, action_list):
+        logging.info(f"Replayed {action_list.name}: {format_timing(self.engine.last_timing)}")
+        if self.engine.coalesce is not None:
+            logging.info(f"Coalesced {action_list.name}: {format_coalesce(self.engine.last_coalesce)}")
+        if self.engine.wait_timeouts:
+            logging.warning(f"{self.engine.wait_timeouts} wait(s) in {action_list.name} timed out")
+        if self.engine.last_wait_error is not None:
+            logging.warning(f"A wait in {action_list.name} failed: {self.engine.last_wait_error}")
+        if self.engine.stopped_by_wait:
+            logging.warning(f"Replay stopped: a {self.engine.stopped_by_wait} wait in {action_list.name} failed")
+        estimate, duration = self.engine.last_estimate, self.engine.last_duration
+        logging.info(f"Duration of {action_list.name}: est. {format_duration(estimate)}, actual {format_duration(duration)}")
+        self.root.after(0, self.refresh_replay_item, action_list)
+        self.root.after(0, self.update_metrics_summary)
+        self.root.after(0, lambda: self.duration_label.config(text=f"Est. {format_duration(estimate)} / Actual {format_duration(duration)}"))
+
+    def start_status_sampling(self):
+        if self.status_job is None:
+            self.status_job = self.root.after(STATUS_INTERVAL, self.sample_status)
+
+    def sample_status(self):
+        # Runs every STATUS_INTERVAL while playing, however many actions were played in between
+        self.status_job = None
+        self.draw_status()
         if self.replaying:
-            if not self.paused:
-                self.paused = True
-                self.status_label.config(text="Status: Paused")
-                self.pause_button.config(text="Resume")
-            else:
-                self.paused = False
-                self.status_label.config(text="Status: Running")
-                self.pause_button.config(text="Pause")
+            self.start_status_sampling()
+
+    def draw_status(self):
+        # The stop handlers call this directly so the final counts are shown
+        progress = self.replay_status.take()
+        if progress is not None and self.tab_built(self.replay_frame):
+            name, current, total, cycles, full_cycles = progress
+            self.current_item_label.config(text=f" {name}, {current}/{total} [{cycles}]")
+            self.cycle_count_label.config(text=f"Cycles: {cycles}")
+            self.full_cycle_label.config(text=f"Full Cycles: {full_cycles}")
+        cycles_text = self.playback_status.take()
+        if cycles_text is not None:
+            self.cycle_count_label.config(text=cycles_text)
+
+    @throttle(PAUSE_TOGGLE_GUARD)
+    def pause_replay(self):
+        # Also called from the keyboard listener thread. The engine wakes on the change at once,
+        # only the widgets wait for the Tk thread.
+        if not self.replaying:
+            return
+        self.paused = not self.paused
+        self.root.after(0, self.update_pause_widgets)
+
+    def set_replay_status(self, text):
+        if self.tab_built(self.replay_frame):
+            self.status_label.config(text=text)
+
+    def update_pause_widgets(self):
+        if not self.replaying or not self.tab_built(self.replay_frame):
+            return
+        if self.paused:
+            self.status_label.config(text="Status: Paused")
+            self.pause_button.config(text="Resume")
+        else:
+            self.status_label.config(text="Status: Running")
+            self.pause_button.config(text="Pause")
 
     def stop_replay(self):
-        self.replaying = False
-        self.paused = False
-        self.status_label.config(text="Status: Stopped")
+        self.engine.stop()
+        self.draw_status()
+        if not self.tab_built(self.replay_frame):
+            return  # Esc while the Record tab plays a recording
+        if self.engine.stopped_by_wait:
+            self.status_label.config(text=f"Status: Stopped, {self.engine.stopped_by_wait} wait failed")
+        else:
+            self.status_label.config(text="Status: Stopped")
         self.start_button.config(state=tk.NORMAL)
         self.pause_button.config(state=tk.DISABLED, text="Pause")
         self.stop_button.config(state=tk.DISABLED)
@@ -1301,23 +1676,21 @@ class ActionRecorder:
             self.root.destroy()
             os._exit(0)  # Force exit
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def edit_selected_action(self):
         selected = self.action_tree.selection()
         if selected:
             self.edit_action_in_tree(None)
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def edit_selected_replay(self):
-        selected = self.replay_tree.selection()
-        if selected:
+        if self.replay_tree.selected_index() is not None:
             self.edit_replay_in_tree(None)
 
-    @debounce(0.3)
+    @debounce(DEBOUNCE_WAIT)
     def delete_replay_item(self):
-        selected = self.replay_tree.selection()
-        if selected:
-            index = self.replay_tree.index(selected[0])
+        index = self.replay_tree.selected_index()
+        if index is not None:
             del self.action_lists[index]
             self.update_replay_list()
 
@@ -1326,69 +1699,110 @@ class ActionRecorder:
             messagebox.showwarning("No Actions", "There are no action lists to save.")
             return
 
-        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=RECORDING_FILETYPES)
         if file_path:
             try:
+                if is_binary_path(file_path):
+                    save_binary(file_path, self.action_lists)
+                    for action_list in self.action_lists:
+                        self.forget_journal(action_list)
+                    messagebox.showinfo("Save Successful", "Replay list saved successfully.")
+                    return
                 data = []
                 for action_list in self.action_lists:
                     data.append({
                         'name': action_list.name,
-                        'actions': action_list.actions,
+                        'actions': list(action_list.actions),
                         'repeat': action_list.repeat,
                         'sequence': action_list.sequence,
                         'interval': action_list.interval,
-                        'active': action_list.active
+                        'active': action_list.active,
+                        'speed': action_list.speed,
+                        'max_gap': action_list.max_gap
                     })
                 with open(file_path, 'w') as file:
                     json.dump(data, file, indent=2)
+                for action_list in self.action_lists:
+                    self.forget_journal(action_list)
                 messagebox.showinfo("Save Successful", "Replay list saved successfully.")
             except Exception as e:
                 messagebox.showerror("Save Error", f"Failed to save replay list: {str(e)}")
                 logging.error(f"Save error: {str(e)}")
 
     def import_replay(self):
-        file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+        file_path = filedialog.askopenfilename(filetypes=RECORDING_FILETYPES)
         if file_path:
-            try:
-                with open(file_path, 'r') as file:
-                    data = json.load(file)
-                    if not isinstance(data, list):
-                        raise ValueError("Invalid file format: expected a list of action lists")
-                
-                    new_action_lists = []
-                    for item in data:
-                        if not isinstance(item, dict):
-                            raise ValueError("Invalid item format: expected a dictionary")
-                        
-                        name = item.get('name')
-                        sequence = item.get('sequence')
-                        interval = item.get('interval', 0)
-                        actions = item.get('actions')
-                        repeat = item.get('repeat')
-                        
-                        if not all(isinstance(x, (str, int)) for x in [name, sequence, interval, repeat]):
-                            raise ValueError("Invalid data types for action list properties")
-                        if not isinstance(actions, list):
-                            raise ValueError("Invalid actions format: expected a list")
-                        
-                        action_list = ActionList(name, sequence, interval)
-                        action_list.actions = actions
-                        action_list.repeat = repeat
-                        action_list.active = item.get('active', True)
-                        new_action_lists.append(action_list)
-                    
-                    self.action_lists = new_action_lists
+            if is_binary_path(file_path):
+                try:
+                    self.action_lists = load_binary(file_path)
                     self.update_replay_list()
-                messagebox.showinfo("Import Successful", "Replay list imported successfully.")
-            except json.JSONDecodeError:
-                messagebox.showerror("Import Error", "Invalid JSON file")
-                logging.error("Import error: Invalid JSON file")
-            except ValueError as e:
-                messagebox.showerror("Import Error", str(e))
-                logging.error(f"Import error: {str(e)}")
+                    messagebox.showinfo("Import Successful", "Replay list imported successfully.")
+                except Exception as e:
+                    messagebox.showerror("Import Error", f"An unexpected error occurred: {str(e)}")
+                    logging.error(f"Import error: {str(e)}")
+                return
+
+            # Lists show up in the replay tree as they are parsed, a failed import restores the old ones
+            previous_lists = self.action_lists
+            self.action_lists = []
+            self.update_replay_list()
+
+            def add_lists(action_lists):
+                self.action_lists.extend(action_lists)
+                self.update_replay_list()
+
+            def done(error):
+                if error is None:
+                    messagebox.showinfo("Import Successful", "Replay list imported successfully.")
+                    return
+                self.action_lists = previous_lists
+                self.update_replay_list()
+                if isinstance(error, json.JSONDecodeError):
+                    messagebox.showerror("Import Error", "Invalid JSON file")
+                    logging.error("Import error: Invalid JSON file")
+                elif isinstance(error, ValueError):
+                    messagebox.showerror("Import Error", str(error))
+                    logging.error(f"Import error: {str(error)}")
+                else:
+                    messagebox.showerror("Import Error", f"An unexpected error occurred: {str(error)}")
+                    logging.error(f"Import error: {str(error)}")
+
+            self.stream_import(iter_action_lists(file_path), add_lists, done)
+
+    def stream_import(self, items, on_batch, on_done):
+        # Iterates items on a worker thread and hands whatever has been parsed to on_batch on the
+        # Tk thread every IMPORT_POLL_INTERVAL ms. on_done(error) follows the last batch.
+        results = queue.Queue()
+
+        def work():
+            try:
+                for item in items:
+                    results.put(('item', item))
+                results.put(('done', None))
             except Exception as e:
-                messagebox.showerror("Import Error", f"An unexpected error occurred: {str(e)}")
-                logging.error(f"Import error: {str(e)}")
+                results.put(('done', e))
+
+        def drain():
+            batch = []
+            finished, error = False, None
+            while True:
+                try:
+                    kind, value = results.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'done':
+                    finished, error = True, value
+                    break
+                batch.append(value)
+            if batch:
+                on_batch(batch)
+            if finished:
+                on_done(error)
+            else:
+                self.root.after(IMPORT_POLL_INTERVAL, drain)
+
+        threading.Thread(target=work, name="importer", daemon=True).start()
+        self.root.after(IMPORT_POLL_INTERVAL, drain)
 
 class EditReplayDialog(simpledialog.Dialog):
     def __init__(self, parent, action_list):
@@ -1422,23 +1836,36 @@ class EditReplayDialog(simpledialog.Dialog):
         self.active_checkbox = ttk.Checkbutton(master, variable=self.active_var)
         self.active_checkbox.grid(row=4, column=1, padx=5, pady=5)
 
+        ttk.Label(master, text="Speed:").grid(row=5, column=0, sticky="w", padx=5, pady=5)
+        self.speed_entry = ttk.Entry(master)
+        self.speed_entry.grid(row=5, column=1, padx=5, pady=5)
+        self.speed_entry.insert(0, str(self.action_list.speed))
+
+        ttk.Label(master, text="Max gap (s, blank = none):").grid(row=6, column=0, sticky="w", padx=5, pady=5)
+        self.max_gap_entry = ttk.Entry(master)
+        self.max_gap_entry.grid(row=6, column=1, padx=5, pady=5)
+        if self.action_list.max_gap is not None:
+            self.max_gap_entry.insert(0, str(self.action_list.max_gap))
+
+        self.estimate_label = ttk.Label(master)
+        self.estimate_label.grid(row=7, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+
         self.actions_tree = ttk.Treeview(master, columns=("Action", "Delay"), show='headings')
         self.actions_tree.heading("Action", text="Action")
         self.actions_tree.heading("Delay", text="Delay (seconds)")
-        self.actions_tree.grid(row=5, column=0, columnspan=2, padx=5, pady=5)
+        self.actions_tree.grid(row=8, column=0, columnspan=2, padx=5, pady=5)
 
         for action in self.action_list.actions:
             action_type, action_detail, delay = action
-            if action_type == 'click':
-                action_str = f"Click at {action_detail}"
-            elif action_type == 'key':
-                action_str = f"Key {action_detail}"
-            self.actions_tree.insert("", tk.END, values=(action_str, f"{delay:.2f}"))
+            self.actions_tree.insert("", tk.END, values=(action_to_string(action_type, action_detail), f"{delay:.2f}"))
 
         self.actions_tree.bind('<Double-1>', self.edit_action)
+        self.speed_entry.bind('<KeyRelease>', self.update_estimate)
+        self.max_gap_entry.bind('<KeyRelease>', self.update_estimate)
+        self.update_estimate()
 
         button_frame = ttk.Frame(master)
-        button_frame.grid(row=6, column=0, columnspan=2, pady=5)
+        button_frame.grid(row=9, column=0, columnspan=2, pady=5)
 
         self.delete_action_button = ttk.Button(button_frame, text="Delete Action", command=self.delete_action)
         self.delete_action_button.pack(side=tk.LEFT, padx=5)
@@ -1449,7 +1876,13 @@ class EditReplayDialog(simpledialog.Dialog):
         self.set_action_button = ttk.Button(button_frame, text="Set", command=self.set_action)
         self.set_action_button.pack(side=tk.LEFT, padx=5)
 
+        self.add_wait_button = ttk.Button(button_frame, text="Add Wait", command=self.add_wait)
+        self.add_wait_button.pack(side=tk.LEFT, padx=5)
+
         return self.name_entry
+
+    def update_estimate(self, event=None):
+        self.estimate_label.config(text=estimate_text(self.actions_tree, self.speed_entry.get(), self.max_gap_entry.get()))
     
     def set_action(self):
         def on_action(x, y, button, pressed):
@@ -1462,6 +1895,7 @@ class EditReplayDialog(simpledialog.Dialog):
             listener.stop()
 
         self.new_action = None
+        load_pynput()
         with mouse.Listener(on_click=on_action) as listener:
             with keyboard.Listener(on_press=on_press) as k_listener:
                 listener.join()
@@ -1472,11 +1906,16 @@ class EditReplayDialog(simpledialog.Dialog):
             if selected:
                 item = selected[0]
                 action_type, action_detail, _ = self.new_action
-                if action_type == 'click':
-                    action_str = f"Click at {action_detail}"
-                elif action_type == 'key':
-                    action_str = f"Key {action_detail}"
-                self.actions_tree.item(item, values=(action_str, "0.00"))
+                self.actions_tree.item(item, values=(action_to_string(action_type, action_detail), "0.00"))
+
+    def add_wait(self):
+        # Inserted after the selected action, at the end without a selection
+        action_str = ask_wait_action(self)
+        if action_str:
+            selected = self.actions_tree.selection()
+            index = self.actions_tree.index(selected[0]) + 1 if selected else tk.END
+            self.actions_tree.insert("", index, values=(action_str, "0.00"))
+            self.update_estimate()
 
     def show(self):
         self.root.after(100, self._show)  # Add a small delay before showing the dialog
@@ -1515,42 +1954,42 @@ class EditReplayDialog(simpledialog.Dialog):
             new_value = simpledialog.askfloat("Edit Delay", "Enter new delay:", initialvalue=float(current_value))
             if new_value is not None:
                 self.actions_tree.set(item, column, f"{new_value:.2f}")
+                self.update_estimate()
 
-    def apply(self):
+    def validate(self):
+        # Everything is parsed here, a bad field or action row keeps the dialog open
         try:
-            name = self.name_entry.get()
             repeat = int(self.repeat_entry.get())
             sequence = int(self.sequence_entry.get())
             interval = int(self.interval_entry.get())
-            active = self.active_var.get()
-            
             if repeat < 0 or sequence < 0 or interval < 0:
                 raise ValueError("Values must be non-negative integers.")
-            
-            # Update the action_list with the new values
-            self.action_list.name = name
-            self.action_list.repeat = repeat
-            self.action_list.sequence = sequence
-            self.action_list.interval = interval
-            self.action_list.active = active
-            
-            # Update actions from the tree
-            self.action_list.actions.clear()
-            for item in self.actions_tree.get_children():
-                action_str, delay_str = self.actions_tree.item(item, 'values')
-                if action_str.startswith("Click at "):
-                    action_type = 'click'
-                    action_detail = eval(action_str.replace("Click at ", ""))
-                elif action_str.startswith("Key "):
-                    action_type = 'key'
-                    action_detail = action_str.replace("Key ", "")
-                delay = float(delay_str)
-                self.action_list.actions.append((action_type, action_detail, delay))
-            
-            self.result = (name, repeat, sequence, interval, active)
+            self.values = (repeat, sequence, interval, parse_speed(self.speed_entry.get()),
+                           parse_max_gap(self.max_gap_entry.get()), tree_actions(self.actions_tree))
+            return True
         except ValueError as e:
             messagebox.showerror("Invalid Input", str(e))
-            self.result = None
+            return False
+
+    def apply(self):
+        name = self.name_entry.get()
+        active = self.active_var.get()
+        repeat, sequence, interval, speed, max_gap, actions = self.values
+        
+        # Update the action_list with the new values
+        self.action_list.name = name
+        self.action_list.repeat = repeat
+        self.action_list.sequence = sequence
+        self.action_list.interval = interval
+        self.action_list.active = active
+        self.action_list.speed = speed
+        self.action_list.max_gap = max_gap
+        
+        # Update actions from the tree
+        self.action_list.actions.clear()
+        self.action_list.actions.extend(actions)
+        
+        self.result = (name, repeat, sequence, interval, active)
 
 class EditCronJobDialog(simpledialog.Dialog):
     def __init__(self, parent, cron_job):
@@ -1564,7 +2003,7 @@ class EditCronJobDialog(simpledialog.Dialog):
         self.name_entry.grid(row=0, column=1, padx=5, pady=5)
         self.name_entry.insert(0, self.cron_job['name'])
 
-        ttk.Label(master, text="Time (HH:MM AM/PM):").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        ttk.Label(master, text="Time (HH:MM AM/PM) or cron:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
         self.time_entry = ttk.Entry(master)
         self.time_entry.grid(row=1, column=1, padx=5, pady=5)
         self.time_entry.insert(0, self.cron_job['time'])
@@ -1574,23 +2013,41 @@ class EditCronJobDialog(simpledialog.Dialog):
         self.active_checkbox = ttk.Checkbutton(master, variable=self.active_var)
         self.active_checkbox.grid(row=2, column=1, padx=5, pady=5)
 
+        ttk.Label(master, text="If still running:").grid(row=3, column=0, sticky="w", padx=5, pady=5)
+        self.overlap_var = tk.StringVar(value=self.cron_job.get('overlap', 'queue'))
+        self.overlap_combobox = ttk.Combobox(master, textvariable=self.overlap_var, values=OVERLAP_POLICIES, state='readonly')
+        self.overlap_combobox.grid(row=3, column=1, padx=5, pady=5)
+
+        ttk.Label(master, text="Speed:").grid(row=4, column=0, sticky="w", padx=5, pady=5)
+        self.speed_entry = ttk.Entry(master)
+        self.speed_entry.grid(row=4, column=1, padx=5, pady=5)
+        self.speed_entry.insert(0, str(self.cron_job.get('speed', 1.0)))
+
+        ttk.Label(master, text="Max gap (s, blank = none):").grid(row=5, column=0, sticky="w", padx=5, pady=5)
+        self.max_gap_entry = ttk.Entry(master)
+        self.max_gap_entry.grid(row=5, column=1, padx=5, pady=5)
+        if self.cron_job.get('max_gap') is not None:
+            self.max_gap_entry.insert(0, str(self.cron_job['max_gap']))
+
+        self.estimate_label = ttk.Label(master)
+        self.estimate_label.grid(row=6, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+
         self.actions_tree = ttk.Treeview(master, columns=("Action", "Delay"), show='headings')
         self.actions_tree.heading("Action", text="Action")
         self.actions_tree.heading("Delay", text="Delay (seconds)")
-        self.actions_tree.grid(row=3, column=0, columnspan=2, padx=5, pady=5)
+        self.actions_tree.grid(row=7, column=0, columnspan=2, padx=5, pady=5)
 
         for action in self.cron_job['actions']:
             action_type, action_detail, delay = action
-            if action_type == 'click':
-                action_str = f"Click at {action_detail}"
-            elif action_type == 'key':
-                action_str = f"Key {action_detail}"
-            self.actions_tree.insert("", tk.END, values=(action_str, f"{delay:.2f}"))
+            self.actions_tree.insert("", tk.END, values=(action_to_string(action_type, action_detail), f"{delay:.2f}"))
 
         self.actions_tree.bind('<Double-1>', self.edit_action)
+        self.speed_entry.bind('<KeyRelease>', self.update_estimate)
+        self.max_gap_entry.bind('<KeyRelease>', self.update_estimate)
+        self.update_estimate()
 
         button_frame = ttk.Frame(master)
-        button_frame.grid(row=4, column=0, columnspan=2, pady=5)
+        button_frame.grid(row=8, column=0, columnspan=2, pady=5)
 
         self.delete_action_button = ttk.Button(button_frame, text="Delete Action", command=self.delete_action)
         self.delete_action_button.pack(side=tk.LEFT, padx=5)
@@ -1603,6 +2060,9 @@ class EditCronJobDialog(simpledialog.Dialog):
 
         return self.name_entry
 
+    def update_estimate(self, event=None):
+        self.estimate_label.config(text=estimate_text(self.actions_tree, self.speed_entry.get(), self.max_gap_entry.get()))
+
     def edit_action(self, event):
         item = self.actions_tree.selection()[0]
         column = self.actions_tree.identify_column(event.x)
@@ -1617,6 +2077,7 @@ class EditCronJobDialog(simpledialog.Dialog):
             new_value = simpledialog.askfloat("Edit Delay", "Enter new delay:", initialvalue=float(current_value))
             if new_value is not None:
                 self.actions_tree.set(item, column, f"{new_value:.2f}")
+                self.update_estimate()
 
     def delete_action(self):
         selected = self.actions_tree.selection()
@@ -1631,8 +2092,13 @@ class EditCronJobDialog(simpledialog.Dialog):
             self.actions_tree.insert("", self.actions_tree.index(item) + 1, values=values)
 
     def add_action(self):
-        action_type = simpledialog.askstring("Add Action", "Enter action type (click/key):")
-        if action_type in ['click', 'key']:
+        action_type = simpledialog.askstring("Add Action", "Enter action type (click/key/image/pixel):")
+        if action_type in WAIT_ACTIONS:
+            action_str = ask_wait_action(self, action_type)
+            if action_str:
+                self.actions_tree.insert("", tk.END, values=(action_str, "0.00"))
+                self.update_estimate()
+        elif action_type in ['click', 'key']:
             if action_type == 'click':
                 x = simpledialog.askinteger("Add Click Action", "Enter X coordinate:")
                 y = simpledialog.askinteger("Add Click Action", "Enter Y coordinate:")
@@ -1646,6 +2112,7 @@ class EditCronJobDialog(simpledialog.Dialog):
             delay = simpledialog.askfloat("Add Action", "Enter delay (seconds):", initialvalue=0.0)
             if delay is not None:
                 self.actions_tree.insert("", tk.END, values=(action_str, f"{delay:.2f}"))
+                self.update_estimate()
 
     def validate(self):
         try:
@@ -1655,8 +2122,11 @@ class EditCronJobDialog(simpledialog.Dialog):
             if not name or not time_str:
                 raise ValueError("Name and Time cannot be empty.")
             
-            # Validate time format
-            datetime.strptime(time_str, "%I:%M %p")
+            # Validate time format or cron expression
+            parse_schedule(time_str)
+            parse_speed(self.speed_entry.get())
+            parse_max_gap(self.max_gap_entry.get())
+            self.actions = tree_actions(self.actions_tree)
             
             return True
         except ValueError as e:
@@ -1669,28 +2139,18 @@ class EditCronJobDialog(simpledialog.Dialog):
         active = self.active_var.get()
         
         # Convert time to cron expression
-        time_obj = datetime.strptime(time_str, "%I:%M %p")
-        cron_expression = f"{time_obj.minute} {time_obj.hour} * * *"
-        
-        # Update actions from the tree
-        actions = []
-        for item in self.actions_tree.get_children():
-            action_str, delay_str = self.actions_tree.item(item, 'values')
-            if action_str.startswith("Click at "):
-                action_type = 'click'
-                action_detail = eval(action_str.replace("Click at ", ""))
-            elif action_str.startswith("Key "):
-                action_type = 'key'
-                action_detail = action_str.replace("Key ", "")
-            delay = float(delay_str)
-            actions.append((action_type, action_detail, delay))
+        cron_expression = parse_schedule(time_str)
         
         self.result = {
             'name': name,
             'cron_expression': cron_expression,
             'time': time_str,
             'active': active,
-            'actions': actions
+            'actions': self.actions,
+            'last_executed': self.cron_job.get('last_executed', '-'),
+            'overlap': self.overlap_var.get(),
+            'speed': parse_speed(self.speed_entry.get()),
+            'max_gap': parse_max_gap(self.max_gap_entry.get())
         }
 
 def main():
@@ -0,0 +1,178 @@
+import json
+import math
+import threading
+from array import array
+from bisect import bisect_left
+
+# Per action playback metrics. The engine fills a ListMetrics for every play_action_list() run
+# without taking locks, then merges it into the shared MetricsRegistry under the list's name.
+#
+#   lateness  actual start of an action minus its scheduled start on the timeline
+#   call      time spent inside the backend (pyautogui) call, per opcode
+#   pause     time spent paused, once per pause
+#
+# The registry exports as JSON or as Prometheus text exposition (*.prom, for node_exporter's
+# textfile collector), see write_metrics().
+
+# Upper bounds in seconds, an implicit +Inf bucket follows
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class Histogram:
+    __slots__ = ('counts', 'total', 'maximum')
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * (len(BUCKETS) + 1)))
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation, the max for the +Inf bucket
+        count = self.count
+        if not count:
+            return 0.0
+        rank = max(1, math.ceil(count * q))
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(BUCKETS[i], self.maximum) if i < len(BUCKETS) else self.maximum
+        return self.maximum
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(BUCKETS + (math.inf,), self.counts):
+            cumulative += count
+            buckets.append(['+Inf' if bound == math.inf else bound, cumulative])
+        return {'count': cumulative, 'sum': self.total, 'max': self.maximum, 'buckets': buckets}
+
+class ListMetrics:
+    def __init__(self):
+        self.lateness = Histogram()
+        self.calls = {}  # op name -> Histogram
+        self.pause = Histogram()
+        self.runs = 0
+
+    def observe(self, op_name, lateness, call):
+        self.lateness.observe(lateness)
+        histogram = self.calls.get(op_name)
+        if histogram is None:
+            histogram = self.calls[op_name] = Histogram()
+        histogram.observe(call)
+
+    def observe_pause(self, seconds):
+        self.pause.observe(seconds)
+
+    def merge(self, other):
+        self.lateness.merge(other.lateness)
+        for op_name, histogram in other.calls.items():
+            self.calls.setdefault(op_name, Histogram()).merge(histogram)
+        self.pause.merge(other.pause)
+        self.runs += other.runs
+
+    @property
+    def actions(self):
+        return self.lateness.count
+
+    def call_seconds(self):
+        return sum(histogram.total for histogram in self.calls.values())
+
+    def to_dict(self):
+        return {
+            'runs': self.runs,
+            'actions': self.actions,
+            'lateness': self.lateness.to_dict(),
+            'call': {op_name: histogram.to_dict() for op_name, histogram in sorted(self.calls.items())},
+            'pause': self.pause.to_dict(),
+        }
+
+class MetricsRegistry:
+    # Totals per action list name, shared by the replay engine and every cron worker
+    def __init__(self):
+        self.lists = {}
+        self.lock = threading.Lock()
+
+    def add(self, name, metrics):
+        with self.lock:
+            self.lists.setdefault(str(name), ListMetrics()).merge(metrics)
+
+    def reset(self):
+        with self.lock:
+            self.lists.clear()
+
+    def snapshot(self):
+        # Copies, so the caller can read them while playback keeps merging
+        with self.lock:
+            copies = {}
+            for name, metrics in self.lists.items():
+                copies[name] = ListMetrics()
+                copies[name].merge(metrics)
+            return copies
+
+    def summary(self):
+        # (name, runs, actions, p99 lateness s, max lateness s, call s, pause s) per list
+        return [(name, metrics.runs, metrics.actions, metrics.lateness.quantile(0.99), metrics.lateness.maximum,
+                 metrics.call_seconds(), metrics.pause.total)
+                for name, metrics in sorted(self.snapshot().items())]
+
+    def to_json(self):
+        return {'lists': {name: metrics.to_dict() for name, metrics in sorted(self.snapshot().items())}}
+
+    def to_prometheus(self):
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+
+        def histogram_lines(metric, labels, histogram):
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (math.inf,), histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else repr(bound)
+                lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{labels}}} {histogram.total!r}')
+            lines.append(f'{metric}_count{{{labels}}} {cumulative}')
+
+        lines.append("# HELP action_recorder_lateness_seconds Actual minus scheduled start of each action.")
+        lines.append("# TYPE action_recorder_lateness_seconds histogram")
+        for name, metrics in snapshot:
+            histogram_lines('action_recorder_lateness_seconds', f'list="{escape_label(name)}"', metrics.lateness)
+        lines.append("# HELP action_recorder_call_seconds Time spent inside the input backend call.")
+        lines.append("# TYPE action_recorder_call_seconds histogram")
+        for name, metrics in snapshot:
+            for op_name, histogram in sorted(metrics.calls.items()):
+                histogram_lines('action_recorder_call_seconds', f'list="{escape_label(name)}",op="{op_name}"', histogram)
+        lines.append("# HELP action_recorder_pause_seconds Time playback spent paused.")
+        lines.append("# TYPE action_recorder_pause_seconds histogram")
+        for name, metrics in snapshot:
+            histogram_lines('action_recorder_pause_seconds', f'list="{escape_label(name)}"', metrics.pause)
+        lines.append("# HELP action_recorder_runs_total Completed or stopped runs of the action list.")
+        lines.append("# TYPE action_recorder_runs_total counter")
+        for name, metrics in snapshot:
+            lines.append(f'action_recorder_runs_total{{list="{escape_label(name)}"}} {metrics.runs}')
+        return "\n".join(lines) + "\n"
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def write_metrics(file_path, registry):
+    # *.json gets the JSON document, anything else the Prometheus text format
+    with open(file_path, 'w') as file:
+        if str(file_path).lower().endswith('.json'):
+            json.dump(registry.to_json(), file, indent=2)
+        else:
+            file.write(registry.to_prometheus())
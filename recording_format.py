@@ -0,0 +1,226 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+import weakref
+from collections.abc import MutableSequence
+
+# Compact binary format for action lists (*.aar), JSON stays the interchange format.
+#
+#   header   magic, version, list count, string count, actions offset
+#   strings  u32 length + utf-8 bytes each, interned key names / list names / extra payloads
+#   lists    name index, sequence, interval, repeat, active, first action, action count,
+#            speed, max gap (negative = none)
+#   actions  fixed size records: opcode, a, b, delay in microseconds since the previous action
+#
+# Fixed size records let load_binary() mmap the file and decode an action only when it is read.
+# The opcodes and encode_action() / decode_action() are also the in-memory codec of ActionColumns,
+# which builds on this module, so ActionColumns and ActionList are imported where they are used.
+
+MAGIC = b'AAR1'
+VERSION = 1
+EXTENSION = '.aar'
+RECORDING_FILETYPES = [("JSON files", "*.json"), ("Binary recordings", "*" + EXTENSION)]
+
+HEADER = struct.Struct('<4sHIIQ')
+STRING_LENGTH = struct.Struct('<I')
+LIST_RECORD = struct.Struct('<IiiiBQIdd')
+ACTION_RECORD = struct.Struct('<BiiQ')
+
+# Record opcodes. OP_OTHER keeps any other action type as [type, detail] JSON in the string table.
+OP_CLICK, OP_KEY, OP_OTHER, OP_MOVE, OP_DRAG, OP_SCROLL, OP_REPEAT = range(7)
+
+# Action types stored as a pair of ints in a and b
+PAIR_OPCODES = {'click': OP_CLICK, 'move': OP_MOVE, 'drag': OP_DRAG, 'scroll': OP_SCROLL, 'repeat': OP_REPEAT}
+PAIR_TYPES = {opcode: action_type for action_type, opcode in PAIR_OPCODES.items()}
+
+def is_binary_path(file_path):
+    return str(file_path).lower().endswith(EXTENSION)
+
+class StringTable:
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+
+    def intern(self, text):
+        if text not in self.index:
+            self.index[text] = len(self.strings)
+            self.strings.append(text)
+        return self.index[text]
+
+def encode_action(action, strings):
+    # (opcode, a, b, delay_us) of an action, key names and other payloads interned in strings,
+    # a StringTable or action_columns.KEY_NAMES
+    try:
+        action_type, action_detail, delay = action
+        delay_us = max(0, round(float(delay) * 1_000_000))
+        if action_type in PAIR_OPCODES:
+            x, y = action_detail
+            return PAIR_OPCODES[action_type], int(x), int(y), delay_us
+        elif action_type == 'key' and isinstance(action_detail, str):
+            return OP_KEY, strings.intern(action_detail), 0, delay_us
+        return OP_OTHER, strings.intern(json.dumps([action_type, action_detail])), 0, delay_us
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid action {action!r}: {str(e)}")
+
+def decode_action(opcode, a, b, delay_us, names):
+    # names is the list the strings were interned into
+    delay = delay_us / 1_000_000
+    if opcode in PAIR_TYPES:
+        return (PAIR_TYPES[opcode], (a, b), delay)
+    elif opcode == OP_KEY:
+        return ('key', names[a], delay)
+    action_type, action_detail = json.loads(names[a])
+    return (action_type, action_detail, delay)
+
+def save_binary(file_path, action_lists):
+    # Lists loaded from file_path still read it through their mapping, copy them out first. The
+    # new file is written next to it and swapped in, the old one is never truncated under a map.
+    release_mapped(file_path)
+    strings = StringTable()
+    list_records = []
+    action_chunks = []
+    first = 0
+    for action_list in action_lists:
+        count = 0
+        for action in action_list.actions:
+            action_chunks.append(ACTION_RECORD.pack(*encode_action(action, strings)))
+            count += 1
+        list_records.append(LIST_RECORD.pack(
+            strings.intern(str(action_list.name)),
+            int(action_list.sequence),
+            int(action_list.interval),
+            int(action_list.repeat),
+            1 if action_list.active else 0,
+            first,
+            count,
+            float(action_list.speed),
+            -1.0 if action_list.max_gap is None else float(action_list.max_gap),
+        ))
+        first += count
+
+    string_chunks = []
+    for text in strings.strings:
+        encoded = text.encode('utf-8')
+        string_chunks.append(STRING_LENGTH.pack(len(encoded)))
+        string_chunks.append(encoded)
+
+    actions_offset = HEADER.size + sum(len(chunk) for chunk in string_chunks) + LIST_RECORD.size * len(list_records)
+    descriptor, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(file_path)))
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, len(list_records), len(strings.strings), actions_offset))
+            file.writelines(string_chunks)
+            file.writelines(list_records)
+            file.writelines(action_chunks)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+# Every BinaryActions still reading a mapped file, for release_mapped()
+MAPPED = weakref.WeakSet()
+
+def release_mapped(file_path):
+    path = os.path.abspath(file_path)
+    for actions in list(MAPPED):
+        if actions.path == path:
+            actions.materialize()
+
+class BinaryActions(MutableSequence):
+    # Read-only view over the mapped action records of one list. The first edit copies the
+    # actions into ActionColumns, so the editors can treat it like any other ActionList.actions.
+    # The copy drops this view's reference to the mapping, which is closed once no list of the
+    # file holds it any more. Call materialize() before removing or overwriting the file,
+    # Windows refuses both while it is mapped.
+    def __init__(self, buffer, offset, count, strings, path=None):
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+        self.strings = strings
+        self.path = path
+        self.items = None
+        MAPPED.add(self)
+
+    def materialize(self):
+        from action_columns import ActionColumns
+        if self.items is None:
+            self.items = ActionColumns(self)
+            self.buffer = None
+            MAPPED.discard(self)
+        return self.items
+
+    def __len__(self):
+        return self.count if self.items is None else len(self.items)
+
+    def __getitem__(self, index):
+        if self.items is not None:
+            return self.items[index]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("action index out of range")
+        record = ACTION_RECORD.unpack_from(self.buffer, self.offset + index * ACTION_RECORD.size)
+        return decode_action(*record, self.strings)
+
+    def __iter__(self):
+        if self.items is not None:
+            yield from self.items
+            return
+        records = memoryview(self.buffer)[self.offset:self.offset + self.count * ACTION_RECORD.size]
+        for record in ACTION_RECORD.iter_unpack(records):
+            yield decode_action(*record, self.strings)
+
+    def __setitem__(self, index, value):
+        self.materialize()[index] = value
+
+    def __delitem__(self, index):
+        del self.materialize()[index]
+
+    def insert(self, index, value):
+        self.materialize().insert(index, value)
+
+    def clear(self):
+        from action_columns import ActionColumns
+        self.items = ActionColumns()
+        self.buffer = None
+        MAPPED.discard(self)
+
+    def copy(self):
+        from action_columns import ActionColumns
+        return ActionColumns(self)
+
+def load_binary(file_path):
+    from engine import ActionList
+    with open(file_path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, list_count, string_count, actions_offset = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Invalid file format: not a binary action recording")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary recording version: {version}")
+
+    position = HEADER.size
+    strings = []
+    for _ in range(string_count):
+        (length,) = STRING_LENGTH.unpack_from(buffer, position)
+        position += STRING_LENGTH.size
+        strings.append(buffer[position:position + length].decode('utf-8'))
+        position += length
+
+    action_lists = []
+    for _ in range(list_count):
+        name, sequence, interval, repeat, active, first, count, speed, max_gap = LIST_RECORD.unpack_from(buffer, position)
+        position += LIST_RECORD.size
+        action_list = ActionList(strings[name], sequence, interval, bool(active))
+        action_list.repeat = repeat
+        action_list.speed = speed
+        action_list.max_gap = None if max_gap < 0 else max_gap
+        action_list.actions = BinaryActions(buffer, actions_offset + first * ACTION_RECORD.size, count, strings,
+                                            os.path.abspath(file_path))
+        action_lists.append(action_list)
+    return action_lists
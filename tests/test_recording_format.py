@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import ActionList
+from recording_format import load_binary, save_binary
+
+# Saving an *.aar back onto the file its lists were loaded from
+#
+#   python -m pytest tests
+
+def make_list(name, actions):
+    action_list = ActionList(name)
+    action_list.actions = actions
+    return action_list
+
+class SaveOverLoadedFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'replay.aar')
+        self.first = [('click', (10, 20), 0.5), ('key', 'a', 0.1), ('write', 'hello', 0.2)]
+        self.second = [('key', 'Key.enter', 0.3), ('scroll', (0, -3), 0.0)]
+        save_binary(self.path, [make_list("First", self.first), make_list("Second", self.second)])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reorder(self):
+        first, second = load_binary(self.path)
+        save_binary(self.path, [second, first])
+        self.assertEqual(list(first.actions), self.first)
+        self.assertEqual(list(second.actions), self.second)
+        reloaded = load_binary(self.path)
+        self.assertEqual([action_list.name for action_list in reloaded], ["Second", "First"])
+        self.assertEqual([list(action_list.actions) for action_list in reloaded], [self.second, self.first])
+
+    def test_delete(self):
+        first, second = load_binary(self.path)
+        save_binary(self.path, [second])
+        self.assertEqual(list(second.actions), self.second)
+        reloaded = load_binary(self.path)
+        self.assertEqual(len(reloaded), 1)
+        self.assertEqual(list(reloaded[0].actions), self.second)
+
+    def test_failed_save_keeps_file(self):
+        first, second = load_binary(self.path)
+        with self.assertRaises(ValueError):
+            save_binary(self.path, [make_list("Broken", [('click', 5, 0.0)])])
+        self.assertEqual([list(action_list.actions) for action_list in load_binary(self.path)], [self.first, self.second])
+        self.assertEqual(os.listdir(self.directory.name), ['replay.aar'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import functools
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+
+# Debounce and throttle without a thread per call. Calls are scheduled on the object's
+# `scheduler` attribute, a TkScheduler in the GUI so the debounced method runs on the Tk thread,
+# or on the shared TIMERS thread for objects without one (headless code, benchmarks).
+# Both schedulers offer call_later(delay, fn) -> handle and cancel(handle).
+
+class TkScheduler:
+    def __init__(self, widget):
+        self.widget = widget
+
+    def call_later(self, delay, fn):
+        return self.widget.after(max(0, round(delay * 1000)), fn)
+
+    def cancel(self, handle):
+        self.widget.after_cancel(handle)
+
+class TimerWheel:
+    # One daemon thread running every callback in deadline order, started on first use
+    def __init__(self, name="timer-wheel"):
+        self.name = name
+        self.heap = []
+        self.entries = {}  # handle -> heap entry, for cancel()
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def call_later(self, delay, fn):
+        with self.condition:
+            handle = next(self.counter)
+            entry = [time.monotonic() + delay, handle, fn]
+            self.entries[handle] = entry
+            heapq.heappush(self.heap, entry)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return handle
+
+    def cancel(self, handle):
+        # Cancelled entries stay in the heap with no callback and are dropped when they come due
+        with self.condition:
+            entry = self.entries.pop(handle, None)
+            if entry is not None:
+                entry[2] = None
+
+    def run(self):
+        while True:
+            with self.condition:
+                while True:
+                    if not self.heap:
+                        self.condition.wait()
+                        continue
+                    deadline, handle, fn = self.heap[0]
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        self.condition.wait(remaining)
+                        continue
+                    heapq.heappop(self.heap)
+                    if fn is not None:
+                        del self.entries[handle]
+                        break
+            try:
+                fn()
+            except Exception:
+                logging.exception(f"Timer callback {fn!r} failed")
+
+TIMERS = TimerWheel()
+
+def debounce(wait):
+    # Runs the method once, wait seconds after the last of a burst of calls, with that call's arguments
+    def decorator(fn):
+        pending = {}  # id(instance) -> (token, handle) of the scheduled call
+        # Guards pending against the listener threads (hotkeys) and the thread firing the call.
+        # Never held while scheduling: Tk's after() from another thread waits for the Tk thread.
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def debounced(self, *args, **kwargs):
+            scheduler = getattr(self, 'scheduler', None) or TIMERS
+            key = id(self)
+            token = object()
+
+            def fire():
+                # A call that lost the race with a newer one finds a different token
+                with lock:
+                    if pending.get(key, (None,))[0] is not token:
+                        return
+                    del pending[key]
+                fn(self, *args, **kwargs)
+
+            with lock:
+                previous = pending.get(key)
+                pending[key] = (token, None)
+            if previous is not None and previous[1] is not None:
+                scheduler.cancel(previous[1])
+            handle = scheduler.call_later(wait, fire)
+            with lock:
+                if pending.get(key, (None,))[0] is token:
+                    pending[key] = (token, handle)
+        return debounced
+    return decorator
+
+def throttle(interval):
+    # Runs the method straight away on the caller's thread and drops calls for interval seconds after
+    def decorator(fn):
+        last_call = {}
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def throttled(self, *args, **kwargs):
+            with lock:
+                now = time.monotonic()
+                if now - last_call.get(id(self), -math.inf) < interval:
+                    return None
+                last_call[id(self)] = now
+            return fn(self, *args, **kwargs)
+        return throttled
+    return decorator
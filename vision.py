@@ -0,0 +1,128 @@
+import importlib.util
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+# Screen checks behind the wait actions. The backend's screenshot() and locate() (pyautogui and
+# pyscreeze) do the work; this keeps them cheap enough to poll every few tens of milliseconds:
+# only the action's region is grabbed, templates are decoded once into TEMPLATES, and both sides
+# are shrunk by DOWNSCALE before matching. A shrunk screenshot only matches approximately, so
+# DOWNSCALE needs OpenCV (locate() then takes a confidence); without it the match is exact at
+# full size. Pixel waits grab nothing but their small rectangle and compare its colour range or
+# checksum. Pillow comes with pyautogui and is only imported here, on the first wait.
+
+DOWNSCALE = 0.5
+CONFIDENCE = 0.9
+TEMPLATE_CACHE_SIZE = 32
+
+_opencv = None
+
+def has_opencv():
+    global _opencv
+    if _opencv is None:
+        _opencv = importlib.util.find_spec('cv2') is not None
+    return _opencv
+
+def shrink(image, scale):
+    if scale == 1.0:
+        return image
+    from PIL import Image
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(size, Image.BILINEAR)
+
+class TemplateCache:
+    # Grayscale, shrunk templates by (path, scale), least recently used dropped first.
+    # A template file changed on disk is decoded again.
+    def __init__(self, size=TEMPLATE_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()  # (path, scale) -> (mtime_ns, image)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, scale=1.0):
+        key = (os.path.abspath(path), scale)
+        mtime = os.stat(key[0]).st_mtime_ns
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        from PIL import Image
+        with Image.open(key[0]) as image:
+            template = shrink(image.convert('L'), scale)
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = (mtime, template)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        return template
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+# Shared by every engine, cron workers wait for the same few images
+TEMPLATES = TemplateCache()
+
+def find_image(backend, path, region=None, templates=TEMPLATES, scale=DOWNSCALE, confidence=CONFIDENCE):
+    # Screen coordinates of the template's centre inside region, (left, top, width, height) or
+    # None for the whole screen. None while the template is not on screen.
+    opencv = has_opencv()
+    if not opencv:
+        scale = 1.0
+    template = templates.get(path, scale)
+    screen = backend.screenshot(region=tuple(region) if region else None)
+    haystack = shrink(screen.convert('L'), scale)
+    options = {'grayscale': True, 'confidence': confidence} if opencv else {'grayscale': True}
+    try:
+        box = backend.locate(template, haystack, **options)
+    except Exception as e:
+        # pyscreeze raises instead of returning None when told to, pyautogui does tell it
+        if type(e).__name__ == 'ImageNotFoundException':
+            return None
+        raise
+    if box is None:
+        return None
+    left, top = (region[0], region[1]) if region else (0, 0)
+    box_left, box_top, width, height = box
+    return (round(left + (box_left + width / 2) / scale), round(top + (box_top + height / 2) / scale))
+
+# Per channel difference a colour target still matches at, screens dither and blend a little
+COLOUR_TOLERANCE = 8
+
+def parse_target(text):
+    # '#rrggbb' for a colour every pixel of the region must have, 'crc32:xxxxxxxx' for the checksum
+    # of the region's RGB bytes. Returns ('colour', (r, g, b)) or ('crc32', value).
+    text = str(text).strip().lower()
+    try:
+        if text.startswith('#') and len(text) == 7:
+            return ('colour', tuple(int(text[i:i + 2], 16) for i in (1, 3, 5)))
+        if text.startswith('crc32:'):
+            return ('crc32', int(text[6:], 16))
+    except ValueError:
+        pass
+    raise ValueError(f"Expected a colour like #1a2b3c or a checksum like crc32:0badf00d, got {text!r}")
+
+def region_checksum(image):
+    return zlib.crc32(image.convert('RGB').tobytes())
+
+def describe_region(backend, region):
+    # The target text matching what the region shows now: its colour when it has only one, else its checksum
+    image = backend.screenshot(region=tuple(region)).convert('RGB')
+    extrema = image.getextrema()
+    if all(low == high for low, high in extrema):
+        return '#' + ''.join(f"{low:02x}" for low, _ in extrema)
+    return f"crc32:{region_checksum(image):08x}"
+
+def region_matches(backend, region, target):
+    # Grabs only region, (left, top, width, height); a single pixel is a 1x1 region
+    image = backend.screenshot(region=region).convert('RGB')
+    kind, value = target
+    if kind == 'crc32':
+        return region_checksum(image) == value
+    return all(abs(low - channel) <= COLOUR_TOLERANCE and abs(high - channel) <= COLOUR_TOLERANCE
+               for (low, high), channel in zip(image.getextrema(), value))
@@ -0,0 +1,146 @@
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualTreeview(ttk.Frame):
+    # Treeview that only materializes the rows that fit on screen. Row k of the widget shows
+    # entry top + k, produced on demand by row_source(index) -> (values, tags), so refreshing
+    # a list of thousands of entries costs the same as refreshing one screenful.
+    def __init__(self, master, columns, row_source, on_select=None):
+        super().__init__(master)
+        self.row_source = row_source
+        self.on_select = on_select
+        self.row_count = 0
+        self.top = 0
+        self.selected = None
+        self.slots = []  # Item ids of the materialized rows
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', selectmode='browse')
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.v_scroll = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.v_scroll.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', lambda event: self.refresh())
+        self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_rows(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_rows(3))
+        self.tree.bind('<Up>', lambda event: self.move_selection(-1))
+        self.tree.bind('<Down>', lambda event: self.move_selection(1))
+        self.tree.bind('<Prior>', lambda event: self.move_selection(-self.visible_rows()))
+        self.tree.bind('<Next>', lambda event: self.move_selection(self.visible_rows()))
+
+    # Pass-throughs used while building the columns
+    def heading(self, column, **kwargs):
+        return self.tree.heading(column, **kwargs)
+
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+
+    def tag_configure(self, tag, **kwargs):
+        return self.tree.tag_configure(tag, **kwargs)
+
+    def identify(self, component, x, y):
+        return self.tree.identify(component, x, y)
+
+    def identify_column(self, x):
+        return self.tree.identify_column(x)
+
+    def visible_rows(self):
+        height = self.tree.winfo_height()
+        header, row_height = 25, 20
+        if self.slots:
+            bbox = self.tree.bbox(self.slots[0])
+            if bbox:
+                header, row_height = bbox[1], bbox[3]
+        return max(1, (height - header) // row_height)
+
+    def set_row_count(self, count):
+        self.row_count = count
+        if self.selected is not None and self.selected >= count:
+            self.selected = None
+        self.refresh()
+
+    def refresh(self):
+        visible = min(self.visible_rows(), self.row_count)
+        self.top = max(0, min(self.top, self.row_count - visible))
+        while len(self.slots) < visible:
+            self.slots.append(self.tree.insert("", tk.END))
+        while len(self.slots) > visible:
+            self.tree.delete(self.slots.pop())
+        for slot in range(len(self.slots)):
+            self.render_slot(slot)
+        self.sync_selection()
+        if self.row_count:
+            self.v_scroll.set(self.top / self.row_count, (self.top + len(self.slots)) / self.row_count)
+        else:
+            self.v_scroll.set(0, 1)
+
+    def render_slot(self, slot):
+        values, tags = self.row_source(self.top + slot)
+        self.tree.item(self.slots[slot], values=values, tags=tags)
+
+    def update_row(self, index):
+        # Re-render a single entry, a no-op when it is scrolled out of view
+        slot = index - self.top
+        if 0 <= slot < len(self.slots):
+            self.render_slot(slot)
+
+    def sync_selection(self):
+        slot = None if self.selected is None else self.selected - self.top
+        if slot is not None and 0 <= slot < len(self.slots):
+            if self.tree.selection() != (self.slots[slot],):
+                self.tree.selection_set(self.slots[slot])
+        elif self.tree.selection():
+            self.tree.selection_set(())
+
+    def on_tree_select(self, event):
+        # Scrolling the selected entry out of view empties the Treeview selection without
+        # deselecting the entry, so only a non-empty selection changes self.selected
+        selection = self.tree.selection()
+        if selection and selection[0] in self.slots:
+            index = self.top + self.slots.index(selection[0])
+            if index != self.selected:
+                self.selected = index
+                if self.on_select:
+                    self.on_select(event)
+
+    def selected_index(self):
+        return self.selected
+
+    def select_index(self, index):
+        self.selected = index
+        visible = len(self.slots) or 1
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + visible:
+            self.top = index - visible + 1
+        self.refresh()
+        if self.on_select:
+            self.on_select(None)
+
+    def clear_selection(self):
+        self.selected = None
+        self.sync_selection()
+
+    def move_selection(self, step):
+        if self.row_count:
+            current = self.top if self.selected is None else self.selected
+            self.select_index(max(0, min(self.row_count - 1, current + step)))
+        return "break"
+
+    def scroll_rows(self, rows):
+        self.top += rows
+        self.refresh()
+
+    def on_mousewheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def on_scrollbar(self, *args):
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * self.row_count)
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self.top += amount * len(self.slots) if args[2] == 'pages' else amount
+        self.refresh()